@@ -6,6 +6,8 @@ export type AACTile = {
   label: string;
   image_url: string;
   tts_lang: string;
+  /** "pending" when the label/image lookup missed the request deadline */
+  status?: "ready" | "pending";
 };
 
 export type AACBoardResponse = {
@@ -13,6 +15,7 @@ export type AACBoardResponse = {
   size: number;
   cats: string[];
   seed: string;
+  pending?: number;
   tiles: AACTile[];
 };
 
@@ -57,3 +60,66 @@ export async function fetchAacBoard(params: {
 
   return await res.json();
 }
+
+export type AACStreamSummary = {
+  type: "summary";
+  lang: string;
+  size: number;
+  cats: string[];
+  seed: string;
+  count: number;
+  pending: number;
+  /** concepts that came back with the placeholder image */
+  placeholders: string[];
+};
+
+/**
+ * Stream AAC board tiles as they resolve (cached tiles first)
+ * GET /aac/board?stream=1  (NDJSON: one tile per line, then a summary)
+ * onTile gets each tile with its board position.
+ */
+export async function streamAacBoard(
+  params: { lang: string; size?: number; cats: string[]; seed: string },
+  onTile: (index: number, tile: AACTile) => void
+): Promise<AACStreamSummary> {
+  const { lang, size = 25, cats, seed } = params;
+
+  const url = new URL(`${API_BASE}/aac/board`);
+  url.searchParams.set("lang", lang);
+  url.searchParams.set("size", String(size));
+  url.searchParams.set("cats", cats.join(","));
+  url.searchParams.set("seed", seed);
+  url.searchParams.set("stream", "1");
+
+  const res = await fetch(url.toString());
+  if (!res.ok || !res.body) {
+    throw new Error("Failed to fetch AAC board");
+  }
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffered = "";
+  let summary: AACStreamSummary | null = null;
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (value) buffered += value;
+
+    const lines = buffered.split("\n");
+    buffered = done ? "" : lines.pop() ?? "";
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const { type, index, ...rest } = JSON.parse(line);
+      if (type === "summary") {
+        summary = { type, ...rest } as AACStreamSummary;
+      } else {
+        onTile(index, rest as AACTile);
+      }
+    }
+    if (done) break;
+  }
+
+  if (!summary) {
+    throw new Error("AAC board stream ended early");
+  }
+  return summary;
+}
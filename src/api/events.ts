@@ -0,0 +1,132 @@
+// src/api/events.ts
+
+export type ProgressEventInput = {
+  type: "tap" | "attempt";
+  learner_id: string;
+  activity_id: string;
+  item?: string;
+  correct?: boolean;
+  duration_ms?: number;
+};
+
+export type ProgressEvent = ProgressEventInput & {
+  event_id: string;
+  ts: string;
+};
+
+const API_BASE =
+  import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000";
+
+/** Events are buffered and sent in batches, not one request per tap */
+const FLUSH_AFTER_MS = 2000;
+const FLUSH_AT = 50;
+const MAX_BATCH = 500;
+/** keepalive requests are limited to 64 KB of body */
+const KEEPALIVE_BATCH = 100;
+/** Oldest events are dropped beyond this (long offline sessions) */
+const MAX_QUEUE = 5000;
+const MAX_BACKOFF_MS = 60000;
+
+const queue: ProgressEvent[] = [];
+let timer: ReturnType<typeof setTimeout> | null = null;
+let inFlight = false;
+let backoffMs = 0;
+
+function newEventId(): string {
+  if (typeof crypto !== "undefined" && "randomUUID" in crypto) {
+    return crypto.randomUUID();
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+}
+
+function schedule() {
+  if (timer === null) {
+    timer = setTimeout(() => {
+      timer = null;
+      void flushEvents();
+    }, FLUSH_AFTER_MS + backoffMs);
+  }
+}
+
+/**
+ * Record a learner event; it is sent with the next batch.
+ * The event id makes retries safe (the server drops duplicates).
+ */
+export function trackEvent(e: ProgressEventInput) {
+  queue.push({ ...e, event_id: newEventId(), ts: new Date().toISOString() });
+  if (queue.length > MAX_QUEUE) {
+    queue.splice(0, queue.length - MAX_QUEUE);
+  }
+  if (queue.length >= FLUSH_AT && backoffMs === 0) {
+    void flushEvents();
+  } else {
+    schedule();
+  }
+}
+
+function retryable(status: number) {
+  return status >= 500 || status === 408 || status === 429;
+}
+
+/**
+ * POST one batch. Returns how many events from its head are done with:
+ * delivered, or rejected by the server (4xx) and dropped. A rejected
+ * batch is split in halves so one bad event doesn't hold back the rest.
+ * Network errors and 5xx stop early; those events are retried later.
+ */
+async function send(batch: ProgressEvent[], keepalive: boolean): Promise<number> {
+  let res: Response;
+  try {
+    res = await fetch(`${API_BASE}/events`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ events: batch }),
+      keepalive,
+    });
+  } catch {
+    return 0; // offline / server down
+  }
+  if (res.ok) return batch.length;
+  if (retryable(res.status)) return 0;
+  if (batch.length === 1) return 1;
+
+  const mid = Math.ceil(batch.length / 2);
+  const head = await send(batch.slice(0, mid), keepalive);
+  if (head < mid) return head;
+  return mid + (await send(batch.slice(mid), keepalive));
+}
+
+/**
+ * Send buffered events
+ * POST /events
+ * Failed batches stay queued and are retried with exponential backoff.
+ */
+export async function flushEvents(keepalive = false): Promise<void> {
+  if (inFlight || queue.length === 0) return;
+  const batch = queue.slice(0, keepalive ? KEEPALIVE_BATCH : MAX_BATCH);
+  inFlight = true;
+  let done = 0;
+  try {
+    done = await send(batch, keepalive);
+  } finally {
+    inFlight = false;
+  }
+  // Newer events may have pushed older ones out of a full queue meanwhile
+  const sent = new Set(batch.slice(0, done).map((e) => e.event_id));
+  for (let i = queue.length - 1; i >= 0; i--) {
+    if (sent.has(queue[i].event_id)) queue.splice(i, 1);
+  }
+
+  if (done < batch.length) {
+    backoffMs = Math.min(MAX_BACKOFF_MS, backoffMs ? backoffMs * 2 : FLUSH_AFTER_MS);
+  } else {
+    backoffMs = 0;
+  }
+  if (queue.length > 0) schedule();
+}
+
+if (typeof window !== "undefined") {
+  window.addEventListener("pagehide", () => {
+    void flushEvents(true);
+  });
+}
@@ -0,0 +1,137 @@
+"""
+Compiled, in-memory index of aac_pool.json.
+
+Requests never touch the filesystem or the JSON parser: they read the
+current PoolIndex, which is swapped atomically by reload_if_changed()
+(run by the scheduler) only when the file's mtime and content hash change.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+POOL_PATH = Path(__file__).parent / "aac_pool.json"
+
+# If the file is missing, serve a minimal safe pool
+DEFAULT_POOL = {"core": ["I", "you", "help", "want", "more", "stop", "go"]}
+
+# Category combinations whose candidates are kept, least recently used dropped
+CANDIDATES_MEMO_MAX = 256
+
+
+def normalize(concept: str) -> str:
+    return concept.lower().strip()
+
+
+@dataclass(frozen=True)
+class PoolIndex:
+    version: str                                # content hash of the pool
+    categories: tuple[str, ...]                 # file order
+    sorted_categories: tuple[str, ...]
+    by_category: dict[str, tuple[str, ...]]     # raw concepts per category
+    concept_ids: dict[str, str]                 # concept -> normalized id
+    _memo: OrderedDict = field(default_factory=OrderedDict, compare=False, repr=False)
+    _memo_lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    def resolve_categories(self, requested: list[str]) -> list[str]:
+        """
+        Known categories from the request, de-duped and sorted so every
+        spelling of a selection shares one memo / cache key; or all of them.
+        """
+        wanted = set(requested)
+        return [c for c in self.sorted_categories if c in wanted] or list(self.categories)
+
+    def candidates(self, cats: tuple[str, ...]) -> tuple[str, ...]:
+        """
+        Concepts of the given categories, de-duped by normalized id with
+        first occurrence kept. Memoized per category combination (LRU,
+        CANDIDATES_MEMO_MAX entries); pass resolve_categories() output.
+        """
+        with self._memo_lock:
+            hit = self._memo.get(cats)
+            if hit is not None:
+                self._memo.move_to_end(cats)
+                return hit
+
+        seen: set[str] = set()
+        unique: list[str] = []
+        for c in cats:
+            for concept in self.by_category.get(c, ()):
+                cid = self.concept_ids[concept]
+                if cid not in seen:
+                    seen.add(cid)
+                    unique.append(concept)
+
+        out = tuple(unique)
+        with self._memo_lock:
+            self._memo[cats] = out
+            if len(self._memo) > CANDIDATES_MEMO_MAX:
+                self._memo.popitem(last=False)
+        return out
+
+    def all_concepts(self) -> tuple[str, ...]:
+        return self.candidates(self.categories)
+
+
+def compile_pool(pool: dict, version: str) -> PoolIndex:
+    by_category = {
+        str(cat): tuple(c for c in concepts if isinstance(c, str) and c.strip())
+        for cat, concepts in pool.items()
+        if isinstance(concepts, list)
+    }
+    concept_ids = {c: normalize(c) for concepts in by_category.values() for c in concepts}
+    return PoolIndex(
+        version=version,
+        categories=tuple(by_category.keys()),
+        sorted_categories=tuple(sorted(by_category.keys())),
+        by_category=by_category,
+        concept_ids=concept_ids,
+    )
+
+
+_lock = threading.Lock()
+_mtime_ns: int | None = None
+_index: PoolIndex = compile_pool(DEFAULT_POOL, "default")
+
+
+def get_pool_index() -> PoolIndex:
+    return _index
+
+
+def reload_if_changed() -> bool:
+    """
+    Recompile the index if aac_pool.json changed. Returns True on swap.
+    An unreadable or invalid file keeps the current index.
+    """
+    global _index, _mtime_ns
+    with _lock:
+        try:
+            mtime_ns = POOL_PATH.stat().st_mtime_ns
+        except OSError:
+            if _index.version == "default":
+                return False
+            _index, _mtime_ns = compile_pool(DEFAULT_POOL, "default"), None
+            return True
+
+        if mtime_ns == _mtime_ns:
+            return False
+
+        try:
+            raw = POOL_PATH.read_bytes()
+            version = hashlib.sha256(raw).hexdigest()[:16]
+            _mtime_ns = mtime_ns
+            if version == _index.version:
+                return False  # touched, not changed
+            pool = json.loads(raw.decode("utf-8"))
+            if not isinstance(pool, dict):
+                return False
+        except (OSError, ValueError):
+            return False
+
+        _index = compile_pool(pool, version)
+        return True
+
+
+reload_if_changed()
@@ -0,0 +1,200 @@
+"""
+Admission control for upstream work.
+
+- Bulkheads: each upstream (translate, tts, arasaac, customsearch) gets
+  its own concurrency limit and a bounded wait queue. Calls beyond
+  limit + queue, or still queued after ADMISSION_QUEUE_TIMEOUT_S, fail
+  fast with Overloaded instead of piling up on a slow upstream.
+- Upstream lane: routes check their caches on the event loop and only
+  offload misses, to a thread lane separate from Starlette's default
+  pool, so cache hits never wait behind blocked upstream calls.
+- Hydrate lane: the same for AAC tile lookups, which run as background
+  tasks (AAC_HYDRATE_CONCURRENCY threads, AAC_HYDRATE_QUEUE pending).
+- Overloaded is turned into 503 + Retry-After by the handler in main.py.
+"""
+import asyncio
+import threading
+from contextlib import nullcontext
+
+import anyio
+
+from .config import settings
+from .metrics import register_collector
+
+
+class Overloaded(Exception):
+    def __init__(self, name: str, retry_after_s: float) -> None:
+        super().__init__(f"{name} is overloaded, retry later")
+        self.name = name
+        self.retry_after_s = retry_after_s
+
+
+class Bulkhead:
+    """Thread-side limit for one upstream: `with admit("tts"): ...`"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int,
+                 queue_timeout_s: float, retry_after_s: float) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.retry_after_s = retry_after_s
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def __enter__(self) -> "Bulkhead":
+        with self._cond:
+            if self.active >= self.max_concurrent:
+                if self.waiting >= self.max_queue:
+                    self.rejected += 1
+                    raise Overloaded(self.name, self.retry_after_s)
+                self.waiting += 1
+                try:
+                    free = self._cond.wait_for(
+                        lambda: self.active < self.max_concurrent, timeout=self.queue_timeout_s
+                    )
+                finally:
+                    self.waiting -= 1
+                if not free:
+                    self.rejected += 1
+                    raise Overloaded(self.name, self.retry_after_s)
+            self.active += 1
+            self.admitted += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+
+_bulkheads = {
+    name: Bulkhead(
+        name,
+        max_concurrent=limit,
+        max_queue=queue,
+        queue_timeout_s=settings.ADMISSION_QUEUE_TIMEOUT_S,
+        retry_after_s=settings.ADMISSION_RETRY_AFTER_S,
+    )
+    for name, (limit, queue) in settings.admission_limits.items()
+}
+
+
+def admit(name: str):
+    """Bulkhead for an upstream; no limit if it isn't in ADMISSION_LIMITS."""
+    return _bulkheads.get(name) or nullcontext()
+
+
+class UpstreamLane:
+    """
+    Event-loop side: worker threads reserved for requests that missed the
+    cache. Beyond threads + queue pending requests, new ones are rejected.
+    """
+
+    def __init__(self, name: str, threads: int, max_queue: int, retry_after_s: float) -> None:
+        self.name = name
+        self.threads = threads
+        self.max_queue = max_queue
+        self.retry_after_s = retry_after_s
+        self._limiter: anyio.CapacityLimiter | None = None
+        self.pending = 0
+        self.rejected = 0
+
+    def limiter(self) -> anyio.CapacityLimiter:
+        # Created lazily: a CapacityLimiter needs a running event loop.
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.threads)
+        return self._limiter
+
+    def _reserve(self) -> None:
+        if self.pending >= self.threads + self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.name, self.retry_after_s)
+        self.pending += 1
+
+    def _release(self, _task=None) -> None:
+        self.pending -= 1
+
+    async def run(self, fn, *args):
+        self._reserve()
+        try:
+            return await anyio.to_thread.run_sync(fn, *args, limiter=self.limiter())
+        finally:
+            self._release()
+
+    def spawn(self, fn, *args) -> asyncio.Task:
+        """
+        Like run(), as a background task. The lane is checked here, so a
+        full lane raises Overloaded to the caller, not inside the task.
+        """
+        self._reserve()
+        task = asyncio.create_task(anyio.to_thread.run_sync(fn, *args, limiter=self.limiter()))
+        task.add_done_callback(self._release)
+        return task
+
+    def stats(self) -> dict:
+        return {
+            "threads": self.threads,
+            "pending": self.pending,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+        }
+
+
+upstream_lane = UpstreamLane(
+    "upstream lane",
+    threads=settings.ADMISSION_UPSTREAM_THREADS,
+    max_queue=settings.ADMISSION_UPSTREAM_QUEUE,
+    retry_after_s=settings.ADMISSION_RETRY_AFTER_S,
+)
+
+hydrate_lane = UpstreamLane(
+    "aac hydrate lane",
+    threads=settings.AAC_HYDRATE_CONCURRENCY,
+    max_queue=settings.AAC_HYDRATE_QUEUE,
+    retry_after_s=settings.ADMISSION_RETRY_AFTER_S,
+)
+
+
+def admission_stats() -> dict:
+    return {
+        "bulkheads": {name: b.stats() for name, b in _bulkheads.items()},
+        "upstream_lane": upstream_lane.stats(),
+        "hydrate_lane": hydrate_lane.stats(),
+    }
+
+
+def _metric_samples():
+    stats = {name: b.stats() for name, b in _bulkheads.items()}
+    lane = upstream_lane.stats()
+    hydrate = hydrate_lane.stats()
+    return [
+        ("admission_active", "gauge", "Upstream calls in progress per bulkhead.",
+         [({"upstream": n}, s["active"]) for n, s in stats.items()]),
+        ("admission_waiting", "gauge", "Upstream calls queued per bulkhead.",
+         [({"upstream": n}, s["waiting"]) for n, s in stats.items()]),
+        ("admission_rejected_total", "counter", "Calls rejected with 503 (queue full or timed out).",
+         [({"upstream": n}, s["rejected"]) for n, s in stats.items()]
+         + [({"upstream": "lane"}, lane["rejected"]), ({"upstream": "hydrate_lane"}, hydrate["rejected"])]),
+        ("admission_lane_pending", "gauge", "Cache-miss requests running or queued in the upstream lane.",
+         [({}, lane["pending"])]),
+        ("admission_hydrate_lane_pending", "gauge", "AAC tile lookups running or queued.",
+         [({}, hydrate["pending"])]),
+    ]
+
+
+register_collector("admission", _metric_samples)
@@ -0,0 +1,170 @@
+"""
+Offline ARASAAC pictogram index.
+
+Built from a keyword catalogue dump (GET /api/pictograms/all/en) so image
+resolution is a few dict/set lookups instead of live searches:
+
+- exact:    keyword -> pictogram ids (inverted index)
+- trigrams: trigram -> keyword ids, for "term inside keyword" matches
+- sorted keyword list (bisect) for prefix matches on 1-2 letter terms
+
+Candidates are ranked with services_google_images._score_item, like live
+search results. Refresh the dump with:
+
+    python -m app.arasaac_index
+
+A server started without a dump picks it up on first use after it appears.
+"""
+import bisect
+import json
+import threading
+from pathlib import Path
+
+import httpx
+
+from . import services_google_images as images
+from .config import settings
+
+CATALOGUE_URL = "https://api.arasaac.org/api/pictograms/all/en"
+
+# Mirrors the live search, which only ranks the first 25 results per term
+MAX_RESULTS_PER_TERM = 25
+
+
+def _normalize(s: str) -> str:
+    return (s or "").strip().lower()
+
+
+def _trigrams(s: str) -> set[str]:
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+class ArasaacIndex:
+    def __init__(self, items: list[dict]) -> None:
+        self.pic_ids: list[int] = []
+        self.pic_items: list[dict] = []               # {"keywords": [...]} for scoring
+        self.exact: dict[str, list[int]] = {}         # keyword -> pic positions
+        kw_pics: dict[str, list[int]] = {}
+
+        for item in items:
+            pic_id = item.get("_id")
+            kws = images._extract_keywords(item)
+            if not pic_id or not kws:
+                continue
+            pos = len(self.pic_ids)
+            self.pic_ids.append(pic_id)
+            self.pic_items.append({"keywords": kws})
+            for kw in dict.fromkeys(kws):
+                self.exact.setdefault(kw, []).append(pos)
+                kw_pics.setdefault(kw, []).append(pos)
+
+        self.keywords: list[str] = sorted(kw_pics)
+        self.trigrams: dict[str, set[int]] = {}
+        for kw_id, kw in enumerate(self.keywords):
+            for g in _trigrams(kw):
+                self.trigrams.setdefault(g, set()).add(kw_id)
+
+    def __len__(self) -> int:
+        return len(self.pic_ids)
+
+    def _keywords_containing(self, term: str) -> list[str]:
+        if len(term) < 3:
+            # Too short for trigrams: prefix scan on the sorted keyword list
+            i = bisect.bisect_left(self.keywords, term)
+            out = []
+            while i < len(self.keywords) and self.keywords[i].startswith(term):
+                out.append(self.keywords[i])
+                i += 1
+            return out
+
+        sets = [self.trigrams.get(g) for g in _trigrams(term)]
+        if not all(sets):
+            return []
+        ids = set.intersection(*sorted(sets, key=len))
+        return [self.keywords[i] for i in sorted(ids) if term in self.keywords[i]]
+
+    def _search(self, term: str) -> list[int]:
+        """Exact keyword matches first, then partial ones (like the API)."""
+        found = list(self.exact.get(term, []))
+        if len(found) < MAX_RESULTS_PER_TERM:
+            seen = set(found)
+            for kw in self._keywords_containing(term):
+                for pos in self.exact[kw]:
+                    if pos not in seen:
+                        seen.add(pos)
+                        found.append(pos)
+                if len(found) >= MAX_RESULTS_PER_TERM:
+                    break
+        return found[:MAX_RESULTS_PER_TERM]
+
+    def best_pictogram_id(self, terms: list[str]) -> int | None:
+        norm = [t for t in (_normalize(x) for x in terms) if t]
+        candidates: list[int] = []
+        for t in norm:
+            candidates.extend(self._search(t))
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda pos: images._score_item(self.pic_items[pos], norm))
+        return self.pic_ids[best]
+
+
+_lock = threading.Lock()
+_index: ArasaacIndex | None = None
+_tried_mtime_ns: int | None = None  # dump that failed to parse, not retried until it changes
+
+
+def catalogue_path() -> Path:
+    p = Path(settings.ARASAAC_CATALOGUE_PATH)
+    return p if p.is_absolute() else settings.data_path / p
+
+
+def get_index() -> ArasaacIndex | None:
+    """
+    The loaded index, or None if no catalogue dump is available.
+    - Until a dump loads, each call checks for one (a stat, no read)
+    - An unparsable dump is retried only once its mtime changes
+    """
+    global _index, _tried_mtime_ns
+    if _index is not None:
+        return _index
+    with _lock:
+        if _index is None:
+            path = catalogue_path()
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+            except OSError:
+                return None
+            if mtime_ns == _tried_mtime_ns:
+                return None
+            _tried_mtime_ns = mtime_ns
+            try:
+                items = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return None
+            _index = ArasaacIndex(items if isinstance(items, list) else [])
+    return _index
+
+
+def download_catalogue(path: Path | None = None) -> int:
+    """Fetch the ARASAAC keyword catalogue and store a compact copy."""
+    path = path or catalogue_path()
+    r = httpx.get(CATALOGUE_URL, timeout=120)
+    r.raise_for_status()
+    compact = [
+        {"_id": it.get("_id"), "keywords": images._extract_keywords(it)}
+        for it in r.json()
+        if it.get("_id")
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(compact, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+    global _index, _tried_mtime_ns
+    with _lock:
+        _index, _tried_mtime_ns = None, None  # pick up the new dump on next use
+    return len(compact)
+
+
+if __name__ == "__main__":
+    print(f"saved {download_catalogue()} pictograms to {catalogue_path()}")
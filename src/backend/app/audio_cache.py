@@ -0,0 +1,172 @@
+"""
+Content-addressed on-disk cache for synthesized TTS audio.
+
+- Key = sha256(text, voice, audio config) -> identical requests share one file
+- Files are written atomically (tmp + rename), so concurrent workers can
+  synthesize the same key without serving a half-written file
+- Responses stream from disk with ETag / If-None-Match, long-lived
+  Cache-Control and single-range HTTP Range support
+- A batch of (text, voice) pairs can be synthesized in parallel and
+  returned as one zip (stored, with an index.json manifest)
+"""
+import hashlib
+import io
+import json
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from .config import settings
+from .fileutil import write_atomic
+from .services_google import TTS_AUDIO_CONFIG, synthesize_speech_mp3
+from .singleflight import flight
+
+AUDIO_DIR = settings.data_path / "tts"
+
+# Bounds concurrent Google TTS calls from batch requests, process-wide
+_batch_pool = ThreadPoolExecutor(
+    max_workers=settings.TTS_BATCH_CONCURRENCY, thread_name_prefix="tts-batch"
+)
+CHUNK_SIZE = 64 * 1024
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def audio_key(text: str, voice: str) -> str:
+    payload = json.dumps(
+        {"text": text, "voice": voice, "config": TTS_AUDIO_CONFIG},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def audio_path(key: str) -> Path:
+    return AUDIO_DIR / key[:2] / f"{key}.mp3"
+
+
+def cached_audio(text: str, voice: str) -> tuple[str, Path] | None:
+    """(key, path) if the audio is already on disk, else None. No upstream call."""
+    key = audio_key(text, voice)
+    path = audio_path(key)
+    return (key, path) if path.exists() else None
+
+
+def get_or_synthesize(text: str, voice: str) -> tuple[str, Path]:
+    """
+    Return (key, path) of the cached MP3, synthesizing it on a miss.
+    Concurrent misses for the same audio share one synthesis call.
+    """
+    key = audio_key(text, voice)
+    path = audio_path(key)
+    if not path.exists():
+        flight.do(("tts", key), _synthesize_to, text, voice, path)
+    return key, path
+
+
+def _synthesize_to(text: str, voice: str, path: Path) -> None:
+    if not path.exists():  # a previous flight may have just written it
+        write_atomic(path, synthesize_speech_mp3(text, voice))
+
+
+def synthesize_many(items: list[tuple[str, str]]) -> list[dict]:
+    """
+    Cached audio for each (text, voice), synthesizing misses in parallel.
+    Duplicates are synthesized once. A failed item is reported, not raised.
+    Returns one manifest entry per input item, in order.
+    """
+    unique = list(dict.fromkeys(items))
+    futures = {item: _batch_pool.submit(get_or_synthesize, *item) for item in unique}
+
+    results: dict[tuple[str, str], dict] = {}
+    for item, fut in futures.items():
+        try:
+            key, path = fut.result()
+            results[item] = {"key": key, "file": f"{key}.mp3", "path": path, "status": "ok"}
+        except Exception as e:
+            results[item] = {"key": None, "file": None, "path": None, "status": "error", "error": str(e)}
+
+    return [
+        {"index": i, "text": text, "lang": voice, **results[(text, voice)]}
+        for i, (text, voice) in enumerate(items)
+    ]
+
+
+def audio_archive(manifest: list[dict]) -> bytes:
+    """
+    Zip of the synthesized MP3s (stored: MP3 doesn't compress) plus
+    index.json mapping each input item to its file.
+    """
+    buf = io.BytesIO()
+    written: set[str] = set()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        for entry in manifest:
+            if entry["status"] == "ok" and entry["file"] not in written:
+                zf.write(entry["path"], entry["file"])
+                written.add(entry["file"])
+        index = [{k: v for k, v in e.items() if k != "path"} for e in manifest]
+        zf.writestr("index.json", json.dumps(index, ensure_ascii=False))
+    return buf.getvalue()
+
+
+def _iter_file(path: Path, start: int, length: int):
+    with path.open("rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def audio_response(request: Request, key: str, path: Path) -> Response:
+    """
+    Serve a cached MP3 with conditional and range request handling.
+    """
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+    inm = request.headers.get("if-none-match")
+    if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    size = path.stat().st_size
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        m = _RANGE_RE.match(range_header.strip())
+        if m and (m.group(1) or m.group(2)):
+            if m.group(1):
+                start = int(m.group(1))
+                end = int(m.group(2)) if m.group(2) else size - 1
+            else:
+                # suffix range: last N bytes
+                start = max(0, size - int(m.group(2)))
+                end = size - 1
+            end = min(end, size - 1)
+            if start > end or start >= size:
+                headers["Content-Range"] = f"bytes */{size}"
+                return Response(status_code=416, headers=headers)
+
+            length = end - start + 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(length)
+            return StreamingResponse(
+                _iter_file(path, start, length),
+                status_code=206,
+                media_type="audio/mpeg",
+                headers=headers,
+            )
+
+    return FileResponse(path, media_type="audio/mpeg", headers=headers)
@@ -0,0 +1,94 @@
+"""
+Disk-backed key/value cache shared by every worker on the host.
+
+- SQLite in WAL mode: many concurrent readers, one writer, no server
+- Keys live in a namespace (e.g. "tr:hi", "img:v2") so a version bump
+  or a new language never collides with old entries
+- Bulk get/set so a whole board is one query
+- Best effort: any SQLite error behaves like a cache miss
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# SQLite's default limit on bound parameters is 999 on older builds;
+# IN (...) lists are bound in chunks of this size
+MAX_SQL_VARS = 900
+
+
+class CacheStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                " ns TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (ns, key)"
+                ") WITHOUT ROWID"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, ns: str, keys: list[str]) -> dict[str, str]:
+        out: dict[str, str] = {}
+        if not keys:
+            return out
+        try:
+            conn = self._conn()
+            for i in range(0, len(keys), MAX_SQL_VARS):
+                chunk = keys[i:i + MAX_SQL_VARS]
+                marks = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value FROM kv WHERE ns = ? AND key IN ({marks})",
+                    (ns, *chunk),
+                )
+                out.update(rows)
+        except sqlite3.Error:
+            return {}
+        return out
+
+    def set_many(self, ns: str, items: dict[str, str]) -> None:
+        if not items:
+            return
+        now = time.time()
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO kv (ns, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                    [(ns, k, v, now) for k, v in items.items()],
+                )
+        except sqlite3.Error:
+            pass
+
+    def get(self, ns: str, key: str) -> str | None:
+        return self.get_many(ns, [key]).get(key)
+
+    def set(self, ns: str, key: str, value: str) -> None:
+        self.set_many(ns, {key: value})
+
+    def items(self, ns: str) -> dict[str, str]:
+        """Every key/value in a namespace (for small namespaces loaded at startup)."""
+        try:
+            return dict(self._conn().execute("SELECT key, value FROM kv WHERE ns = ?", (ns,)))
+        except sqlite3.Error:
+            return {}
+
+    def clear(self) -> None:
+        try:
+            self._conn().execute("DELETE FROM kv")
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,70 @@
+"""
+Minimal circuit breaker for flaky upstreams.
+
+closed    -> calls go through; N consecutive failures trip it open
+open      -> calls are refused immediately until reset_after_s passes
+half_open -> one trial call is let through; success closes, failure re-opens
+"""
+import threading
+import time
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_after_s: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_after_s = reset_after_s
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < self.reset_after_s:
+                    self.rejected += 1
+                    return False
+                self._state = "half_open"
+                self._trial_in_flight = False
+            # half_open: a single trial at a time
+            if self._trial_in_flight:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a half-open trial that ended without an outcome (e.g. shed)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self.trips += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
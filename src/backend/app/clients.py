@@ -0,0 +1,137 @@
+"""
+Long-lived upstream clients shared by the whole app.
+
+- One keep-alive httpx pool for ARASAAC / Custom Search
+- One Translate client and one Text-to-Speech client (gRPC channel)
+- Opened/closed by the FastAPI lifespan in main.py; created lazily on
+  first use so scripts and the scheduler work without the app running
+- The Google SDKs (grpc, protobuf) are imported on first use too, so
+  they don't delay startup; preload() does it in the background
+"""
+import threading
+from typing import TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from google.cloud import texttospeech
+    from google.cloud import translate_v2 as translate
+
+from .config import settings
+from .metrics import register_collector
+
+
+class ClientRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._http: httpx.Client | None = None
+        self._translate: "translate.Client | None" = None
+        self._tts: "texttospeech.TextToSpeechClient | None" = None
+        self._stats = {
+            "http_requests": 0,
+            "http_connections_opened": 0,
+            "http_tls_handshakes": 0,
+            "translate_clients_created": 0,
+            "tts_clients_created": 0,
+        }
+
+    # --- counters (fed by httpx/httpcore trace events) ---
+
+    def _inc(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self._inc("http_connections_opened")
+        elif event_name == "connection.start_tls.complete":
+            self._inc("http_tls_handshakes")
+
+    def _on_request(self, request: httpx.Request) -> None:
+        self._inc("http_requests")
+        request.extensions["trace"] = self._trace
+
+    # --- clients ---
+
+    def http(self) -> httpx.Client:
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                            max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+                            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_S,
+                        ),
+                        event_hooks={"request": [self._on_request]},
+                    )
+        return self._http
+
+    def translate(self) -> "translate.Client":
+        if self._translate is None:
+            from google.cloud import translate_v2 as translate
+
+            with self._lock:
+                if self._translate is None:
+                    self._translate = translate.Client()
+                    self._stats["translate_clients_created"] += 1
+        return self._translate
+
+    def tts(self) -> "texttospeech.TextToSpeechClient":
+        if self._tts is None:
+            from google.cloud import texttospeech
+
+            with self._lock:
+                if self._tts is None:
+                    self._tts = texttospeech.TextToSpeechClient()
+                    self._stats["tts_clients_created"] += 1
+        return self._tts
+
+    def open(self) -> None:
+        # The HTTP pool is cheap to create; Google clients need credentials,
+        # so they stay lazy and a missing key doesn't block startup.
+        self.http()
+
+    def preload(self) -> None:
+        """Import the Google SDKs ahead of the first translate/TTS call."""
+        from google.cloud import texttospeech, translate_v2  # noqa: F401
+
+    def close(self) -> None:
+        with self._lock:
+            http, tr, tts = self._http, self._translate, self._tts
+            self._http = self._translate = self._tts = None
+
+        if http is not None:
+            http.close()
+        if tr is not None:
+            try:
+                tr._http.close()
+            except Exception:
+                pass
+        if tts is not None:
+            try:
+                tts.transport.close()
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+        s["http_connections_reused"] = max(0, s["http_requests"] - s["http_connections_opened"])
+        return s
+
+
+registry = ClientRegistry()
+
+
+def _metric_samples():
+    st = registry.stats()
+    return [
+        ("upstream_http_requests_total", "counter", "Requests sent through the shared HTTP pool.",
+         [({}, st["http_requests"])]),
+        ("upstream_http_connections_opened_total", "counter", "New TCP connections opened by the pool.",
+         [({}, st["http_connections_opened"])]),
+    ]
+
+
+register_collector("clients", _metric_samples)
@@ -1,20 +1,141 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     APP_ENV: str = "dev"
     CORS_ORIGINS: str = "http://localhost:5173"
+    DATA_REFRESH_ENABLED: bool = True
     DATA_REFRESH_MINUTES: int = 60
-    HF_DATASETS: str = "ag_news,emotion"  # comma-separated
+    HF_DATASETS: str = "ag_news,emotion"  # comma-separated, "name" or "name:sample_size"
+    HF_SAMPLE_SIZE: int = 200              # default rows per dataset sample
+    HF_REFRESH_WORKERS: int = 4            # datasets refreshed concurrently
+    HF_INCREMENTAL: bool = True            # skip datasets whose Hub revision is unchanged
+
+    # Local state (caches, snapshots); relative paths are under the backend dir
+    DATA_DIR: str = "var"
+    AAC_CACHE_DB: str = "aac_cache.sqlite3"  # shared by all workers on the host
+
+    # In-process AAC caches (translations, images)
+    AAC_CACHE_MAX_ENTRIES: int = 20000
+    AAC_CACHE_TTL_S: float = 7 * 24 * 3600
+    AAC_CACHE_NEGATIVE_TTL_S: float = 300   # fallbacks are retried after this
+
+    # Pre-encoded /aac/board responses for deterministic seeds
+    AAC_BOARD_CACHE_MAX_ENTRIES: int = 2000
+    AAC_BOARD_MAX_AGE_S: int = 3600        # HTTP max-age for fixed-seed boards
+
+    # AAC tile hydration (/aac/board, /aac/symbols)
+    AAC_HYDRATE_CONCURRENCY: int = 16      # max parallel upstream lookups
+    AAC_HYDRATE_QUEUE: int = 256           # lookups waiting beyond that -> 503
+    AAC_HYDRATE_DEADLINE_MS: int = 4000    # default per-request deadline
+
+    # Import the Google SDKs, seed the translation memory and build the ML
+    # model in the background after startup instead of on first request
+    PRELOAD_ENABLED: bool = True
+
+    # Background warm-up of the whole AAC pool for every language
+    AAC_WARMUP_ENABLED: bool = True
+    AAC_WARMUP_RATE_PER_S: float = 5.0     # upstream calls per second
+    AAC_WARMUP_TTS: bool = False           # also pre-synthesize label audio
+
+    # POST /i18n/tts/batch: parallel syntheses shared by all batch requests
+    TTS_BATCH_CONCURRENCY: int = 8
+    TTS_BATCH_MAX_ITEMS: int = 200
+
+    # How often to check aac_pool.json for changes (hot reload)
+    AAC_POOL_WATCH_S: int = 5
+
+    # Offline ARASAAC keyword catalogue (python -m app.arasaac_index);
+    # relative paths are under DATA_DIR
+    ARASAAC_CATALOGUE_PATH: str = "arasaac_catalogue_en.json"
+
+    # Image resolution: one time budget per concept, parallel + hedged
+    # ARASAAC searches, and a breaker that trips after repeated failures
+    IMAGE_RESOLVE_BUDGET_S: float = 6.0
+    ARASAAC_HEDGE_AFTER_S: float = 0.8
+    ARASAAC_SEARCH_WORKERS: int = 32
+    ARASAAC_BREAKER_FAILURES: int = 5
+    ARASAAC_BREAKER_RESET_S: float = 30.0
+
+    # Pictogram proxy (/aac/image/{id}): board/symbols return "upstream"
+    # ARASAAC URLs or "proxy" URLs to resized variants by default
+    AAC_IMAGE_URLS: str = "upstream"
+    AAC_IMAGE_DEFAULT_SIZE: int = 128      # one of 96, 128, 256
+
+    # Admission control: per-upstream "concurrency/queue" bulkheads, and
+    # the thread lane that cache-miss requests run in
+    ADMISSION_LIMITS: str = "translate=8/32,tts=8/32,arasaac=32/128,customsearch=4/16"
+    ADMISSION_QUEUE_TIMEOUT_S: float = 5.0
+    ADMISSION_RETRY_AFTER_S: float = 2.0
+    ADMISSION_UPSTREAM_THREADS: int = 32
+    ADMISSION_UPSTREAM_QUEUE: int = 128
+
+    # Translation memory consulted before Google Translate: seeded from the
+    # frontend locale bundles (relative to the backend dir) + tm_glossary.json
+    TM_SEED_ENABLED: bool = True
+    TM_LOCALES_DIR: str = "../i18n/locales"
+    TM_MAX_TEXT_CHARS: int = 500           # longer texts aren't memorized
+    TM_MAX_MT_ENTRIES: int = 50000         # per language pair
+    TM_LANGS: str = "en,hi,ta,te,kn,ml,mr,bn,gu,pa,ur"  # pairs that get an MT tier
+
+    # Progress events (POST /events): append-only log + SQLite rollups under
+    # DATA_DIR; batches queued within the window share one fsync/commit
+    EVENTS_LOG: str = "events/events.jsonl"
+    EVENTS_DB: str = "events/rollups.sqlite3"
+    EVENTS_BATCH_MAX: int = 500
+    EVENTS_COMMIT_WINDOW_MS: float = 5.0
+    EVENTS_QUEUE_MAX: int = 20000           # queued events beyond this -> 503
+    EVENTS_FSYNC: bool = True
+
+    # Shared keep-alive HTTP pool for ARASAAC / Custom Search
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE: int = 10
+    HTTP_KEEPALIVE_EXPIRY_S: float = 30.0
+
+    @property
+    def admission_limits(self) -> Dict[str, tuple[int, int]]:
+        out = {}
+        for part in self.ADMISSION_LIMITS.split(","):
+            name, _, limits = part.strip().partition("=")
+            if name:
+                concurrency, _, queue = limits.partition("/")
+                out[name] = (int(concurrency), int(queue or 0))
+        return out
 
     @property
     def cors_list(self) -> List[str]:
         return [x.strip() for x in self.CORS_ORIGINS.split(",") if x.strip()]
 
+    @property
+    def data_path(self) -> Path:
+        p = Path(self.DATA_DIR)
+        return p if p.is_absolute() else BACKEND_DIR / p
+
+    @property
+    def tm_locales_path(self) -> Path:
+        p = Path(self.TM_LOCALES_DIR)
+        return p if p.is_absolute() else BACKEND_DIR / p
+
+    @property
+    def tm_langs_list(self) -> List[str]:
+        return [x.strip() for x in self.TM_LANGS.split(",") if x.strip()]
+
     @property
     def hf_datasets_list(self) -> List[str]:
-        return [x.strip() for x in self.HF_DATASETS.split(",") if x.strip()]
+        return [x.split(":")[0].strip() for x in self.HF_DATASETS.split(",") if x.strip()]
+
+    @property
+    def hf_sample_sizes(self) -> Dict[str, int]:
+        out = {}
+        for x in self.HF_DATASETS.split(","):
+            name, _, size = x.partition(":")
+            if name.strip() and size.strip().isdigit():
+                out[name.strip()] = int(size.strip())
+        return out
 
 settings = Settings()
@@ -0,0 +1,148 @@
+"""
+Search indexes over a cached dataset sample, built once per refresh.
+
+- Field index: value -> row ids, for every scalar column (ints, bools and
+  short strings); values match case-insensitively ("label=3", "topic=World")
+- Text index: token -> row ids over every string column; a keyword query
+  matches rows containing all of its tokens
+- Posting lists are sorted row ids (plus a set for membership), so a page
+  costs a bisect into the shortest list and a walk of about `limit` rows
+- Cursors are opaque: base64 of {sample version, query hash, last row id};
+  a refreshed sample or a different query invalidates them
+"""
+import base64
+import hashlib
+import json
+import re
+from bisect import bisect_right
+from itertools import islice
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Longer strings are free text: searchable with q, not filterable by value
+FIELD_MAX_CHARS = 64
+
+# Word characters plus the Indic blocks (Devanagari .. Sinhala), whose
+# vowel signs are not \w on their own
+_TOKEN = re.compile(r"[\w\u0900-\u0DFF]+")
+
+
+def tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+def field_key(value) -> str:
+    return str(value).casefold()
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class StaleCursor(InvalidCursor):
+    pass
+
+
+class _Postings:
+    __slots__ = ("ids", "members")
+
+    def __init__(self) -> None:
+        self.ids: list[int] = []
+        self.members: set[int] = set()
+
+    def add(self, row: int) -> None:
+        # Rows are added in order, so ids stay sorted
+        if not self.ids or self.ids[-1] != row:
+            self.ids.append(row)
+            self.members.add(row)
+
+
+class DatasetIndex:
+    def __init__(self, table: "pa.Table", version: str) -> None:
+        self.version = version
+        self.num_rows = table.num_rows
+        self.fields: dict[str, dict[str, _Postings]] = {}
+        self.text: dict[str, _Postings] = {}
+
+        for column in table.column_names:
+            values = table.column(column).to_pylist()
+            strings = [v for v in values if isinstance(v, str)]
+            scalar = all(v is None or isinstance(v, (str, int, float, bool)) for v in values)
+            if scalar and all(len(s) <= FIELD_MAX_CHARS for s in strings):
+                index = self.fields[column] = {}
+                for row, v in enumerate(values):
+                    if v is not None:
+                        index.setdefault(field_key(v), _Postings()).add(row)
+            if strings:
+                for row, v in enumerate(values):
+                    if isinstance(v, str):
+                        for tok in tokens(v):
+                            self.text.setdefault(tok, _Postings()).add(row)
+
+    def _postings(self, filters: dict[str, str], q: Optional[str]) -> Optional[list[_Postings]]:
+        """Posting lists every match must be in; None when nothing is filtered."""
+        lists: list[_Postings] = []
+        for column, value in filters.items():
+            lists.append(self.fields[column].get(field_key(value), _Postings()))
+        for tok in dict.fromkeys(tokens(q or "")):
+            lists.append(self.text.get(tok, _Postings()))
+        return lists or None
+
+    def search(
+        self, filters: dict[str, str], q: Optional[str], after: int, skip: int, limit: int
+    ) -> tuple[list[int], bool]:
+        """Row ids of the next page (ids > after, first `skip` dropped) and whether more follow."""
+        lists = self._postings(filters, q)
+        if lists is None:
+            start = after + 1 + skip
+            ids = list(range(start, min(start + limit + 1, self.num_rows)))
+            return ids[:limit], len(ids) > limit
+
+        lists.sort(key=lambda p: len(p.ids))
+        driver, others = lists[0], lists[1:]
+        out: list[int] = []
+        for row in islice(driver.ids, bisect_right(driver.ids, after), None):
+            if all(row in p.members for p in others):
+                if skip:
+                    skip -= 1
+                    continue
+                if len(out) == limit:
+                    return out, True
+                out.append(row)
+        return out, False
+
+    # --- cursors ---
+
+    @staticmethod
+    def query_hash(filters: dict[str, str], q: Optional[str]) -> str:
+        canon = json.dumps(
+            [sorted((k, field_key(v)) for k, v in filters.items()), tokens(q or "")],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canon.encode("utf-8")).hexdigest()[:12]
+
+    def encode_cursor(self, query_hash: str, row: int) -> str:
+        raw = json.dumps({"v": self.version, "q": query_hash, "r": row}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, cursor: str, query_hash: str) -> int:
+        """Last row id of the previous page."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            data = json.loads(raw)
+            version, qh, row = data["v"], data["q"], int(data["r"])
+        except (ValueError, TypeError, KeyError):
+            raise InvalidCursor("Malformed cursor")
+        if version != self.version:
+            raise StaleCursor("Cursor is from an older sample of this dataset")
+        if qh != query_hash:
+            raise InvalidCursor("Cursor belongs to a different query")
+        return row
+
+
+def sample_version(meta: dict) -> str:
+    """Identifies one cached sample; cursors don't survive a refresh."""
+    basis = f"{meta.get('fingerprint')}|{meta.get('last_refreshed_utc')}|{meta.get('sample_count_cached')}"
+    return hashlib.sha256(basis.encode("utf-8")).hexdigest()[:12]
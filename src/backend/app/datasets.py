@@ -1,65 +1,254 @@
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
 from datetime import datetime, timezone
+from itertools import islice
 
-from datasets import load_dataset  # huggingface datasets
 from .config import settings
+from .dataset_index import DatasetIndex, sample_version
 
+# pyarrow and the HuggingFace libraries are heavy: they are imported by the
+# functions that need them (snapshot load / refresh run in the background)
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# name -> {"meta": {...}, "table": pa.Table, "index": DatasetIndex}
 CACHE: Dict[str, Dict[str, Any]] = {}
 
+def _empty_table() -> "pa.Table":
+    import pyarrow as pa
+
+    return pa.table({})
+
+def _empty_entry(meta: Dict[str, Any]) -> Dict[str, Any]:
+    table = _empty_table()
+    return {"meta": meta, "table": table, "index": DatasetIndex(table, sample_version(meta))}
+
+# Last good sample of each dataset, as Arrow IPC files (memory-mapped on load)
+SNAPSHOT_DIR = settings.data_path / "datasets"
+
+# What each dataset is currently served from, and whether its last refresh failed
+READINESS: Dict[str, Dict[str, bool]] = {}  # name -> {"snapshot", "fresh", "error"}
+
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
-def refresh_dataset(name: str, sample_size: int = 200) -> Dict[str, Any]:
+def dataset_fingerprint(name: str, sample_size: int) -> Optional[str]:
+    """
+    Hub revision (commit sha) of the dataset + the sample size.
+    None if the Hub can't be reached: the dataset is then always refreshed.
+    """
+    from huggingface_hub import HfApi
+
+    try:
+        sha = HfApi().dataset_info(name, timeout=10).sha
+    except Exception:
+        return None
+    return f"{sha}:{sample_size}" if sha else None
+
+def _snapshot_paths(name: str):
+    safe = name.replace("/", "__")
+    return SNAPSHOT_DIR / f"{safe}.arrow", SNAPSHOT_DIR / f"{safe}.json"
+
+def _write_snapshot(name: str, table: "pa.Table", meta: Dict[str, Any]) -> None:
+    """Persist the sample atomically (tmp file + rename)."""
+    import pyarrow as pa
+
+    arrow_path, meta_path = _snapshot_paths(name)
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = arrow_path.with_suffix(".arrow.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, arrow_path)
+    tmp_meta = meta_path.with_suffix(".json.tmp")
+    tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_meta, meta_path)
+
+def _mark(name: str, **flags: bool) -> None:
+    state = READINESS.setdefault(name, {"snapshot": False, "fresh": False, "error": False})
+    state.update(flags)
+
+def load_snapshots() -> List[str]:
+    """
+    Serve the last good sample of every configured dataset right away.
+    Tables are memory-mapped, so this is fast and doesn't copy the data.
+    """
+    pending = [
+        name for name in settings.hf_datasets_list
+        if name not in CACHE and _snapshot_paths(name)[0].exists()
+    ]
+    if not pending:
+        return []  # nothing to load: skip the pyarrow import
+    import pyarrow as pa
+
+    loaded = []
+    for name in pending:
+        arrow_path, meta_path = _snapshot_paths(name)
+        try:
+            source = pa.memory_map(str(arrow_path), "r")
+            table = pa.ipc.open_file(source).read_all()
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError, pa.ArrowException):
+            continue
+        meta["status"] = "ready"
+        meta["source"] = "snapshot"
+        CACHE[name] = {"meta": meta, "table": table, "index": DatasetIndex(table, sample_version(meta))}
+        _mark(name, snapshot=True)
+        loaded.append(name)
+    return loaded
+
+def readiness() -> Dict[str, Any]:
     """
-    Loads a small sample using streaming=True (no full download).
+    Datasets are optional demo data, so they only hold readiness back while
+    a first refresh is still running with no snapshot to serve. A failed
+    refresh, or refresh being disabled, still counts as ready.
     """
-    meta = {
+    datasets = {
+        name: READINESS.get(name, {"snapshot": False, "fresh": False, "error": False})
+        for name in settings.hf_datasets_list
+    }
+    return {
+        "ready": all(
+            d["snapshot"] or d["fresh"] or d["error"] or not settings.DATA_REFRESH_ENABLED
+            for d in datasets.values()
+        ),
+        "snapshot_loaded": all(d["snapshot"] for d in datasets.values()),
+        "fresh_loaded": all(d["fresh"] for d in datasets.values()),
+        "serving": all(d["snapshot"] or d["fresh"] for d in datasets.values()),
+        "datasets": datasets,
+    }
+
+def _empty_meta(name: str, status: str) -> Dict[str, Any]:
+    return {
         "name": name,
         "last_refreshed_utc": None,
+        "last_checked_utc": None,
         "sample_count_cached": 0,
-        "status": "loading",
+        "sample_size": None,
+        "fingerprint": None,
+        "status": status,
+        "source": None,
         "error": None,
     }
 
+def refresh_dataset(name: str, sample_size: Optional[int] = None, incremental: bool = False) -> Dict[str, Any]:
+    """
+    Loads a small sample using streaming=True (no full download) into a
+    columnar Arrow table.
+    incremental=True skips the download when the fingerprint is unchanged.
+    """
+    import pyarrow as pa
+    from datasets import load_dataset  # huggingface datasets
+
+    if sample_size is None:
+        sample_size = settings.hf_sample_sizes.get(name, settings.HF_SAMPLE_SIZE)
+
+    fingerprint = dataset_fingerprint(name, sample_size)
+    current = CACHE.get(name)
+    if (
+        incremental
+        and fingerprint is not None
+        and current is not None
+        and current["meta"]["status"] == "ready"
+        and current["meta"]["fingerprint"] == fingerprint
+    ):
+        current["meta"]["last_checked_utc"] = utc_now_iso()
+        current["meta"]["source"] = "fresh"  # verified current
+        _mark(name, fresh=True, error=False)
+        return current["meta"]
+
+    meta = _empty_meta(name, "loading")
+    meta["sample_size"] = sample_size
+    meta["fingerprint"] = fingerprint
+
     try:
         ds = load_dataset(name, split="train", streaming=True)  # streaming mode :contentReference[oaicite:4]{index=4}
-        rows: List[dict] = []
-        for i, row in enumerate(ds):
-            rows.append(dict(row))
-            if i + 1 >= sample_size:
-                break
-
-        meta["last_refreshed_utc"] = utc_now_iso()
-        meta["sample_count_cached"] = len(rows)
+        table = pa.Table.from_pylist([dict(row) for row in islice(ds, sample_size)])
+
+        meta["last_refreshed_utc"] = meta["last_checked_utc"] = utc_now_iso()
+        meta["sample_count_cached"] = table.num_rows
         meta["status"] = "ready"
+        meta["source"] = "fresh"
 
+        # Indexes are built before the swap, so queries never see a
+        # sample without its index
+        index = DatasetIndex(table, sample_version(meta))
+
+        # Single assignment: readers see either the old or the new sample
         CACHE[name] = {
             "meta": meta,
-            "rows": rows,
+            "table": table,
+            "index": index,
         }
+        _mark(name, fresh=True, error=False)
+        try:
+            _write_snapshot(name, table, meta)
+        except (OSError, pa.ArrowException):
+            pass  # still serving from memory; next refresh retries
         return meta
 
     except Exception as e:
         meta["status"] = "error"
         meta["error"] = str(e)
-        CACHE[name] = {"meta": meta, "rows": []}
+        _mark(name, error=True)
+        # Keep serving the last good sample if there is one
+        if current is not None and current["meta"]["status"] == "ready":
+            current["meta"]["error"] = str(e)
+            return current["meta"]
+        CACHE[name] = _empty_entry(meta)
         return meta
 
-def refresh_all() -> List[Dict[str, Any]]:
-    results = []
-    for name in settings.hf_datasets_list:
-        results.append(refresh_dataset(name))
-    return results
+def refresh_all(incremental: Optional[bool] = None) -> List[Dict[str, Any]]:
+    """Refresh every configured dataset concurrently."""
+    if incremental is None:
+        incremental = settings.HF_INCREMENTAL
+    names = settings.hf_datasets_list
+    if not names:
+        return []
+    workers = max(1, min(settings.HF_REFRESH_WORKERS, len(names)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hf-refresh") as pool:
+        return list(pool.map(lambda n: refresh_dataset(n, incremental=incremental), names))
 
 def list_datasets() -> List[Dict[str, Any]]:
     results = []
     for name in settings.hf_datasets_list:
         if name not in CACHE:
-            CACHE[name] = {"meta": {"name": name, "status": "not_loaded", "error": None, "last_refreshed_utc": None, "sample_count_cached": 0}, "rows": []}
+            CACHE[name] = _empty_entry(_empty_meta(name, "not_loaded"))
         results.append(CACHE[name]["meta"])
     return results
 
-def get_samples(name: str, limit: int = 25) -> List[Dict[str, Any]]:
+def search_samples(
+    name: str,
+    filters: Dict[str, str],
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 25,
+    offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    One page of rows matching every field filter and every keyword of q,
+    in sample order, plus an opaque cursor for the next page (None at the end).
+    offset skips matches and only applies without a cursor.
+    Raises ValueError for an unindexed field or a bad cursor (StaleCursor
+    once the sample was refreshed).
+    """
     if name not in CACHE:
         refresh_dataset(name)
-    return (CACHE.get(name, {}).get("rows") or [])[:limit]
+    entry = CACHE[name]  # one read: table and index always belong together
+    table, index = entry["table"], entry["index"]
+
+    unknown = sorted(set(filters) - set(index.fields))
+    if unknown:
+        raise ValueError(
+            f"Not filterable: {', '.join(unknown)} (indexed fields: {', '.join(index.fields) or 'none'})"
+        )
+
+    query_hash = index.query_hash(filters, q)
+    after = index.decode_cursor(cursor, query_hash) if cursor else -1
+    ids, more = index.search(filters, q, after, 0 if cursor else offset, limit)
+    return {
+        "rows": table.take(ids).to_pylist() if ids else [],
+        "next_cursor": index.encode_cursor(query_hash, ids[-1]) if more else None,
+    }
@@ -0,0 +1,387 @@
+"""
+Progress events (AAC taps, activity attempts): append-only log + rollups.
+
+- POSTed batches are queued for one writer thread that group-commits:
+  everything queued within EVENTS_COMMIT_WINDOW_MS is appended to the
+  JSONL log with one write + fsync, then folded into the SQLite rollups
+  in one transaction, and all those requests are answered together
+- Rollups: one row per (learner, activity, ISO week) with tap / attempt /
+  correct / wrong counts and time spent, so a caseload's progress is one
+  indexed read instead of a scan over raw events
+- event_id makes batches idempotent: client retries are dropped
+- The log is the source of truth: the rollups store the log offset they
+  include, and before each commit the writer replays any tail past it
+  (a crash between the fsync and the SQLite commit)
+- Workers sharing the log and database take an exclusive flock on the
+  log for each commit, so appends, replays and the stored offset never
+  interleave; an event is folded only by the commit that records its id
+"""
+import asyncio
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from .admission import Overloaded
+from .cache_store import MAX_SQL_VARS
+from .config import settings
+from .metrics import Counter, Histogram
+
+EVENTS_INGESTED = Counter(
+    "events_ingested_total", "Progress events committed to the log.", ("type",)
+)
+EVENTS_DUPLICATES = Counter(
+    "events_duplicates_total", "Progress events dropped as retries (known event_id)."
+)
+EVENTS_COMMIT_SECONDS = Histogram(
+    "events_commit_duration_seconds", "Group commit: log append + fsync + rollup transaction."
+)
+EVENTS_COMMIT_SIZE = Histogram(
+    "events_commit_batch_size", "Events per group commit.",
+    buckets=(1, 5, 10, 50, 100, 500, 1000, 5000),
+)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS rollup ("
+    " learner_id TEXT NOT NULL,"
+    " activity_id TEXT NOT NULL,"
+    " week TEXT NOT NULL,"
+    " taps INTEGER NOT NULL DEFAULT 0,"
+    " attempts INTEGER NOT NULL DEFAULT 0,"
+    " correct INTEGER NOT NULL DEFAULT 0,"
+    " wrong INTEGER NOT NULL DEFAULT 0,"
+    " duration_ms INTEGER NOT NULL DEFAULT 0,"
+    " last_ts TEXT NOT NULL,"
+    " PRIMARY KEY (learner_id, activity_id, week)"
+    ") WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS rollup_by_activity ON rollup (activity_id, week)",
+    "CREATE TABLE IF NOT EXISTS seen (event_id TEXT PRIMARY KEY) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID",
+)
+
+_COUNTS = ("taps", "attempts", "correct", "wrong", "duration_ms")
+
+
+def _path(name: str) -> Path:
+    p = Path(name)
+    return p if p.is_absolute() else settings.data_path / p
+
+
+def iso_week(d: date) -> str:
+    year, week, _ = d.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # the fsynced log covers the rest
+    for stmt in _SCHEMA:
+        conn.execute(stmt)
+    return conn
+
+
+@contextmanager
+def _locked(log):
+    """Exclusive lock on the log, shared with every worker appending to it."""
+    fcntl.flock(log.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(log.fileno(), fcntl.LOCK_UN)
+
+
+def _seen(conn: sqlite3.Connection, ids: list[str]) -> set[str]:
+    seen: set[str] = set()
+    for i in range(0, len(ids), MAX_SQL_VARS):
+        chunk = ids[i:i + MAX_SQL_VARS]
+        rows = conn.execute(
+            f"SELECT event_id FROM seen WHERE event_id IN ({','.join('?' * len(chunk))})", chunk
+        )
+        seen.update(r[0] for r in rows)
+    return seen
+
+
+def _fold(events: list[dict]) -> dict[tuple[str, str, str], dict]:
+    """Aggregate events into rollup deltas, one per (learner, activity, week)."""
+    deltas: dict[tuple[str, str, str], dict] = {}
+    for e in events:
+        ts = _utc(datetime.fromisoformat(e["ts"]))
+        key = (e["learner_id"], e["activity_id"], iso_week(ts.date()))
+        d = deltas.setdefault(key, {**dict.fromkeys(_COUNTS, 0), "last_ts": ""})
+        if e["type"] == "tap":
+            d["taps"] += 1
+        else:
+            d["attempts"] += 1
+            d["correct"] += e.get("correct") is True
+            d["wrong"] += e.get("correct") is False
+        d["duration_ms"] += e.get("duration_ms") or 0
+        d["last_ts"] = max(d["last_ts"], ts.isoformat())
+    return deltas
+
+
+class _Pending:
+    __slots__ = ("events", "future", "loop")
+
+    def __init__(self, events: list[dict], future: asyncio.Future, loop) -> None:
+        self.events = events
+        self.future = future
+        self.loop = loop
+
+    def resolve(self, result=None, error: BaseException | None = None) -> None:
+        def _set():
+            if self.future.done():
+                return  # the request was cancelled (client went away)
+            if error is not None:
+                self.future.set_exception(error)
+            else:
+                self.future.set_result(result)
+
+        try:
+            self.loop.call_soon_threadsafe(_set)
+        except RuntimeError:
+            pass  # event loop already closed (shutdown)
+
+
+class EventLog:
+    def __init__(self, log_path: Path, db_path: Path) -> None:
+        self.log_path = log_path
+        self.db_path = db_path
+        self._cond = threading.Condition()
+        self._queue: list[_Pending] = []
+        self._queued_events = 0
+        self._thread: threading.Thread | None = None
+        self._closing = False
+        self._local = threading.local()
+        self.commits = 0
+
+    # --- lifecycle ---
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name="events-writer", daemon=True)
+                self._thread.start()
+
+    def close(self) -> None:
+        """Commit what is queued, then stop the writer."""
+        with self._cond:
+            thread, self._closing = self._thread, True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout=10)
+        with self._cond:
+            self._thread = None
+
+    # --- ingestion ---
+
+    async def submit(self, events: list[dict]) -> dict:
+        """Queue a batch; resolves once it is in the log and the rollups."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        pending = _Pending(events, loop.create_future(), loop)
+        with self._cond:
+            if self._queued_events + len(events) > settings.EVENTS_QUEUE_MAX:
+                raise Overloaded("events", settings.ADMISSION_RETRY_AFTER_S)
+            self._queue.append(pending)
+            self._queued_events += len(events)
+            self._cond.notify()
+        return await pending.future
+
+    def _run(self) -> None:
+        try:
+            self._serve()
+        except Exception as e:
+            # Storage unusable: fail what is queued; the next submit restarts the writer
+            with self._cond:
+                group, self._queue, self._queued_events = self._queue, [], 0
+            for p in group:
+                p.resolve(error=e)
+
+    def _serve(self) -> None:
+        conn = _connect(self.db_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "ab") as log:
+            with _locked(log):
+                self._recover(conn, log)
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closing:
+                        self._cond.wait()
+                    if not self._queue:
+                        break  # closing and drained
+                if settings.EVENTS_COMMIT_WINDOW_MS > 0 and not self._closing:
+                    time.sleep(settings.EVENTS_COMMIT_WINDOW_MS / 1000)  # let more batches join
+                with self._cond:
+                    group, self._queue, self._queued_events = self._queue, [], 0
+                try:
+                    results = self._commit(conn, log, group)
+                except Exception as e:
+                    for p in group:
+                        p.resolve(error=e)
+                else:
+                    for p, result in zip(group, results):
+                        p.resolve(result)
+        conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, log, group: list[_Pending]) -> list[dict]:
+        t0 = time.perf_counter()
+        with _locked(log):
+            self._recover(conn, log)  # another worker may have died mid-commit
+            seen = _seen(conn, list({e["event_id"] for p in group for e in p.events}))
+
+            fresh: list[dict] = []
+            results = []
+            for p in group:
+                accepted = 0
+                for e in p.events:
+                    if e["event_id"] in seen:
+                        continue
+                    seen.add(e["event_id"])  # also drops repeats within the group
+                    fresh.append(e)
+                    accepted += 1
+                results.append({"accepted": accepted, "duplicates": len(p.events) - accepted})
+
+            if fresh:
+                log.write(b"".join(
+                    json.dumps(e, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+                    for e in fresh
+                ))
+                log.flush()
+                if settings.EVENTS_FSYNC:
+                    os.fsync(log.fileno())
+                self._apply(conn, fresh, os.fstat(log.fileno()).st_size)
+                self.commits += 1
+                EVENTS_COMMIT_SIZE.observe(len(fresh))
+                for e in fresh:
+                    EVENTS_INGESTED.inc(e["type"])
+
+        duplicates = sum(r["duplicates"] for r in results)
+        if duplicates:
+            EVENTS_DUPLICATES.inc(amount=duplicates)
+        EVENTS_COMMIT_SECONDS.observe(time.perf_counter() - t0)
+        return results
+
+    def _apply(self, conn: sqlite3.Connection, events: list[dict], log_offset: int) -> list[dict]:
+        """
+        Fold events into the rollups and record the log offset, atomically.
+        Only events whose id wasn't recorded yet are folded; returns those.
+        """
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            applied = [
+                e for e in events
+                if conn.execute(
+                    "INSERT OR IGNORE INTO seen (event_id) VALUES (?)", (e["event_id"],)
+                ).rowcount == 1
+            ]
+            deltas = _fold(applied)
+            conn.executemany(
+                "INSERT INTO rollup (learner_id, activity_id, week, taps, attempts, correct, wrong,"
+                " duration_ms, last_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (learner_id, activity_id, week) DO UPDATE SET"
+                " taps = taps + excluded.taps,"
+                " attempts = attempts + excluded.attempts,"
+                " correct = correct + excluded.correct,"
+                " wrong = wrong + excluded.wrong,"
+                " duration_ms = duration_ms + excluded.duration_ms,"
+                " last_ts = max(last_ts, excluded.last_ts)",
+                [(*key, *(d[c] for c in _COUNTS), d["last_ts"]) for key, d in deltas.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES ('log_offset', ?)", (str(log_offset),)
+            )
+        return applied
+
+    def _recover(self, conn: sqlite3.Connection, log) -> None:
+        """
+        Fold in log lines written after the last rollup commit. Callers hold
+        the log lock, so a partial last line is a dead writer's torn append.
+        """
+        row = conn.execute("SELECT value FROM state WHERE key = 'log_offset'").fetchone()
+        offset = int(row[0]) if row else 0
+        end = os.fstat(log.fileno()).st_size
+        if end <= offset:
+            return
+        with open(self.log_path, "rb") as f:
+            f.seek(offset)
+            tail = f.read(end - offset)
+        complete = tail[:tail.rfind(b"\n") + 1]
+        if len(complete) < len(tail):
+            log.truncate(offset + len(complete))  # torn last line: never acknowledged
+        parsed = (json.loads(line) for line in complete.splitlines() if line.strip())
+        self._apply(conn, list({e["event_id"]: e for e in parsed}.values()), offset + len(complete))
+
+    # --- reads ---
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.db_path)
+        return conn
+
+    def rollups(
+        self, learner_ids: list[str], activity_id: Optional[str] = None, weeks: Optional[int] = None
+    ) -> dict:
+        """Rollup rows (learner, activity, week order) plus per-learner totals."""
+        where, args = [], []
+        if activity_id:
+            where.append("activity_id = ?")
+            args.append(activity_id)
+        if weeks:
+            since = datetime.now(timezone.utc).date() - timedelta(weeks=weeks - 1)
+            where.append("week >= ?")
+            args.append(iso_week(since))
+
+        # Learner ids go in bounded IN (...) chunks; sorted, so the chunks'
+        # results concatenate in learner order
+        ids = sorted(set(learner_ids))
+        chunks = [ids[i:i + MAX_SQL_VARS] for i in range(0, len(ids), MAX_SQL_VARS)] or [None]
+
+        rows, learners = [], {}
+        conn = self._reader()
+        for chunk in chunks:
+            clauses, params = list(where), list(args)
+            if chunk is not None:
+                clauses.append(f"learner_id IN ({','.join('?' * len(chunk))})")
+                params.extend(chunk)
+            sql = (
+                "SELECT learner_id, activity_id, week, taps, attempts, correct, wrong, duration_ms, last_ts"
+                " FROM rollup" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+                + " ORDER BY learner_id, activity_id, week"
+            )
+            for learner, activity, week, *counts, last_ts in conn.execute(sql, params):
+                row = {"learner_id": learner, "activity_id": activity, "week": week,
+                       **dict(zip(_COUNTS, counts)), "last_ts": last_ts}
+                rows.append(_with_accuracy(row))
+                total = learners.setdefault(learner, {**dict.fromkeys(_COUNTS, 0), "last_ts": last_ts})
+                for c in _COUNTS:
+                    total[c] += row[c]
+                total["last_ts"] = max(total["last_ts"], last_ts)
+        return {"rows": rows, "learners": {k: _with_accuracy(v) for k, v in learners.items()}}
+
+    def stats(self) -> dict:
+        with self._cond:
+            queued = self._queued_events
+        return {"queued_events": queued, "commits": self.commits}
+
+
+def _with_accuracy(counts: dict) -> dict:
+    graded = counts["correct"] + counts["wrong"]
+    counts["accuracy"] = round(100 * counts["correct"] / graded, 1) if graded else None
+    return counts
+
+
+event_log = EventLog(_path(settings.EVENTS_LOG), _path(settings.EVENTS_DB))
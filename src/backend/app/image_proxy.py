@@ -0,0 +1,111 @@
+"""
+Pictogram proxy with an on-disk cache of resized variants.
+
+- The 500px ARASAAC source is fetched once per pictogram and kept under
+  DATA_DIR/images/src
+- Variants (96/128/256 px, WebP or palette PNG) are rendered with Pillow
+  on first request, then served from disk
+- Variants never change for a given id/size/format, so they are served
+  with a strong ETag and an immutable Cache-Control
+"""
+import io
+import re
+from pathlib import Path
+
+import httpx
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from .audio_cache import CACHE_CONTROL
+from .config import settings
+from .fileutil import write_atomic
+from .services_google_images import ARASAAC_PNG, fetch_arasaac
+from .singleflight import flight
+
+IMAGE_DIR = settings.data_path / "images"
+SIZES = (96, 128, 256)
+FORMATS = {"webp": "image/webp", "png": "image/png"}
+
+# Bump when the resize/encode settings change (part of the ETag and path)
+VARIANT_VERSION = "v1"
+
+_ARASAAC_ID_RE = re.compile(r"^https://static\.arasaac\.org/pictograms/(\d+)/\d+_500\.png$")
+
+
+def pictogram_id(url: str) -> int | None:
+    """ARASAAC pictogram id of an upstream image URL, if it is one."""
+    m = _ARASAAC_ID_RE.match(url or "")
+    return int(m.group(1)) if m else None
+
+
+def source_path(pic_id: int) -> Path:
+    return IMAGE_DIR / "src" / f"{pic_id}.png"
+
+
+def variant_path(pic_id: int, size: int, fmt: str) -> Path:
+    return IMAGE_DIR / VARIANT_VERSION / str(size) / f"{pic_id}.{fmt}"
+
+
+def _fetch_source(pic_id: int, path: Path) -> None:
+    if path.exists():  # a previous flight may have just written it
+        return
+    try:
+        r = fetch_arasaac(ARASAAC_PNG.format(pic_id, pic_id), timeout=10.0, label="arasaac_static")
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise HTTPException(status_code=404, detail="Unknown pictogram")
+        raise HTTPException(status_code=502, detail="ARASAAC image fetch failed")
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="ARASAAC image fetch failed")
+    write_atomic(path, r.content)
+
+
+def _render(src: Path, size: int, fmt: str) -> bytes:
+    from PIL import Image  # only needed once per variant
+
+    with Image.open(src) as im:
+        im = im.convert("RGBA")
+        im.thumbnail((size, size), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        if fmt == "webp":
+            im.save(out, "WEBP", quality=85, method=4)
+        else:
+            # Pictograms are flat-colour: a palette PNG is a fraction of RGBA
+            im.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(out, "PNG", optimize=True)
+        return out.getvalue()
+
+
+def _make_variant(pic_id: int, size: int, fmt: str, path: Path) -> None:
+    if path.exists():
+        return
+    src = source_path(pic_id)
+    if not src.exists():
+        flight.do(("imgsrc", pic_id), _fetch_source, pic_id, src)
+    write_atomic(path, _render(src, size, fmt))
+
+
+def get_variant(pic_id: int, size: int, fmt: str) -> Path:
+    """Path of the cached variant, fetching/rendering it on a miss."""
+    path = variant_path(pic_id, size, fmt)
+    if not path.exists():
+        flight.do(("imgvar", pic_id, size, fmt), _make_variant, pic_id, size, fmt, path)
+    return path
+
+
+def negotiate_format(request: Request, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "webp" if "image/webp" in request.headers.get("accept", "") else "png"
+
+
+def image_response(request: Request, pic_id: int, size: int, fmt: str, path: Path,
+                   negotiated: bool) -> Response:
+    etag = f'"{pic_id}-{size}-{fmt}-{VARIANT_VERSION}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if negotiated:
+        headers["Vary"] = "Accept"
+
+    inm = request.headers.get("if-none-match")
+    if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=FORMATS[fmt], headers=headers)
@@ -1,11 +1,47 @@
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from .admission import Overloaded, admission_stats, hydrate_lane
+from .clients import registry
+from .config import settings
+from .services_google_images import breaker_stats
+from .datasets import load_snapshots, readiness
+from .metrics import MetricsMiddleware, limiter_samples, render as render_metrics
+from .scheduler import start_aac_pool_watch, start_aac_warmup, start_preload, start_scheduler, stop_scheduler
+from .startup import mark as mark_startup
 from .routes_datasets import router as datasets_router
 from .routes_i18n import router as i18n_router
 from .routes_aac import router as aac_router
+from .routes_ml import router as ml_router
+from .routes_events import router as events_router
+from .events import event_log
+from .translation_memory import get_memory
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared upstream clients live for the whole process
+    registry.open()
+    event_log.start()  # replays any log tail the rollups missed
+    start_aac_pool_watch()
+    # Last good dataset samples (memory-mapped), with or without refresh
+    await anyio.to_thread.run_sync(load_snapshots)
+    if settings.DATA_REFRESH_ENABLED:
+        start_scheduler()
+    if settings.PRELOAD_ENABLED:
+        start_preload()  # SDK imports, translation memory, ML model
+    if settings.AAC_WARMUP_ENABLED:
+        start_aac_warmup()
+    mark_startup("startup_complete")
+    yield
+    stop_scheduler()
+    event_log.close()
+    registry.close()
 
-app = FastAPI(title="Saarthi Backend", version="1.0.0")
+app = FastAPI(title="Saarthi Backend", version="1.0.0", lifespan=lifespan)
 
 # CORS (keep broad for local dev)
 app.add_middleware(
@@ -14,13 +50,53 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request, exc: Overloaded):
+    return JSONResponse(
+        {"detail": str(exc)},
+        status_code=503,
+        headers={"Retry-After": str(max(1, round(exc.retry_after_s)))},
+    )
 
 @app.get("/")
 def health():
+    mark_startup("health")
     return {"status": "ok"}
 
+@app.get("/ready")
+def ready():
+    # 503 only while a first dataset refresh runs with no snapshot to serve
+    state = readiness()
+    if state["ready"]:
+        mark_startup("ready")
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # async: limiter statistics must be read on the event loop
+    extra = limiter_samples("default", anyio.to_thread.current_default_thread_limiter())
+    extra += limiter_samples("aac_hydrate", hydrate_lane.limiter())
+    return PlainTextResponse(render_metrics(extra), media_type="text/plain; version=0.0.4")
+
+@app.get("/stats/clients")
+def client_stats():
+    return {
+        **registry.stats(),
+        "breakers": breaker_stats(),
+        "admission": admission_stats(),
+        "translation_memory": get_memory().stats(),
+        "events": event_log.stats(),
+    }
+
 # Routers
 app.include_router(datasets_router)
 app.include_router(i18n_router)
 app.include_router(aac_router)
+app.include_router(ml_router)
+app.include_router(events_router)
+
+mark_startup("app_imported")
@@ -0,0 +1,244 @@
+"""
+Prometheus text-format metrics, without a client library.
+
+- Counters / gauges / histograms keyed by a tuple of label values
+- Collectors: callables run at scrape time for values that already live
+  elsewhere (cache stats, breaker state, thread pools)
+- MetricsMiddleware: in-flight requests and request latency per route
+- observe_upstream(): latency + outcome of each Google / ARASAAC call
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+# Seconds; upstream calls range from a few ms (cache-adjacent) to the
+# 6 s image budget
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{n}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for n, v in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _num(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(self.label_names, k)} {_num(v)}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts, sum, count]
+
+    def observe(self, value: float, *labels) -> None:
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    s[0][i] += 1
+                    break
+            s[1] += value
+            s[2] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        out = self._header()
+        names = self.label_names + ("le",)
+        for k, (counts, total, n) in items:
+            cumulative = 0
+            for b, c in zip(self.buckets, counts):
+                cumulative += c
+                out.append(f"{self.name}_bucket{_labels(names, k + (_num(b),))} {cumulative}")
+            out.append(f"{self.name}_bucket{_labels(names, k + ('+Inf',))} {n}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, k)} {_num(total)}")
+            out.append(f"{self.name}_count{_labels(self.label_names, k)} {n}")
+        return out
+
+
+REGISTRY: list[_Metric] = []
+
+# name -> collector returning [(metric name, type, help, [(labels dict, value)])]
+Sample = tuple[str, str, str, Iterable[tuple[dict, float]]]
+_collectors: dict[str, Callable[[], Iterable[Sample]]] = {}
+
+
+def register_collector(name: str, fn: Callable[[], Iterable[Sample]]) -> None:
+    _collectors[name] = fn
+
+
+def render(extra: Iterable[Sample] = ()) -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+
+    samples: list[Sample] = []
+    for fn in list(_collectors.values()):
+        try:
+            samples.extend(fn())
+        except Exception:
+            continue  # a broken collector must not break the scrape
+    samples.extend(extra)
+
+    # Samples of the same metric from different collectors share a header
+    grouped: dict[str, tuple[str, str, list]] = {}
+    for name, kind, help, values in samples:
+        grouped.setdefault(name, (kind, help, []))[2].extend(values)
+    for name, (kind, help, values) in grouped.items():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, v in values:
+            lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_num(v)}")
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# Upstream calls
+# -----------------------------
+UPSTREAM_SECONDS = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to Google Translate / TTS / Custom Search and ARASAAC.",
+    ("upstream", "outcome"),
+)
+
+
+@contextmanager
+def observe_upstream(upstream: str):
+    t0 = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_SECONDS.observe(time.perf_counter() - t0, upstream, outcome)
+
+
+# -----------------------------
+# HTTP requests
+# -----------------------------
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being handled.", ("method",)
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to the end of the response, per route template.",
+    ("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: counts in-flight requests and times responses."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method)
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(method)
+            route = scope.get("route")
+            # Unmatched paths share one label to keep cardinality bounded
+            template = getattr(route, "path", None) or "unmatched"
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - t0, method, template, f"{status['code'] // 100}xx"
+            )
+
+
+# -----------------------------
+# Shared collectors
+# -----------------------------
+def cache_samples(caches: dict[str, object]) -> list[Sample]:
+    """Samples for TTLCache instances, labelled by cache name."""
+    stats = {name: c.stats() for name, c in caches.items()}
+    return [
+        ("aac_cache_hits_total", "counter", "Memory cache hits.",
+         [({"cache": n}, s["hits"]) for n, s in stats.items()]),
+        ("aac_cache_misses_total", "counter", "Memory cache misses.",
+         [({"cache": n}, s["misses"]) for n, s in stats.items()]),
+        ("aac_cache_evictions_total", "counter", "Entries evicted by the size limit.",
+         [({"cache": n}, s["evictions"]) for n, s in stats.items()]),
+        ("aac_cache_hit_ratio", "gauge", "hits / (hits + misses) since start.",
+         [({"cache": n}, s["hit_ratio"]) for n, s in stats.items()]),
+        ("aac_cache_entries", "gauge", "Entries currently held.",
+         [({"cache": n}, s["size"]) for n, s in stats.items()]),
+    ]
+
+
+def limiter_samples(name: str, limiter) -> list[Sample]:
+    """Saturation of an anyio CapacityLimiter (call from the event loop)."""
+    st = limiter.statistics()
+    return [
+        ("threadpool_tokens", "gauge", "Worker thread slots.",
+         [({"pool": name}, limiter.total_tokens)]),
+        ("threadpool_busy", "gauge", "Worker thread slots in use.",
+         [({"pool": name}, st.borrowed_tokens)]),
+        ("threadpool_waiting", "gauge", "Tasks queued for a worker thread.",
+         [({"pool": name}, st.tasks_waiting)]),
+    ]
@@ -1,26 +1,25 @@
-from typing import List
+"""
+Activity recommender over activity_catalogue.json.
+
+- Each activity is a row of a TF-IDF matrix (title + tags + goals), built
+  once and L2-normalized so a dot product is a cosine similarity
+- A learner is scored against every activity in one pass:
+  goal membership + text similarity to the goal + age fit + difficulty fit
+- Top k is picked with argpartition; a caseload is a single matrix product
+- numpy / scikit-learn are imported when the model is first built
+  (get_model), not when the app starts
+"""
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
 from .models import SuggestRequest
 
-ACTIVITY_BANK = {
-    "speech": [
-        "Picture Naming (AAC): show image → child says word",
-        "Repeat-after-me: 5 short words → 3 rounds",
-        "Syllable tapping: clap for each syllable",
-        "Mirror practice: mouth shapes for 5 phonemes",
-    ],
-    "attention": [
-        "Match the Pair: 8 cards → find pairs",
-        "Visual schedule: 4-step routine ordering",
-        "Color/shape sorting: 10 objects",
-        "Spot the difference: 5 differences",
-    ],
-    "social": [
-        "Emotion cards: identify happy/sad/angry",
-        "Turn-taking game: roll & move",
-        "Greeting practice: hello/please/thank you",
-        "Role play: simple daily scenarios",
-    ],
-}
+if TYPE_CHECKING:
+    import numpy as np
+
+CATALOGUE_PATH = Path(__file__).parent / "activity_catalogue.json"
 
 LANG_TEMPLATES = {
     "en": "Suggestions based on goal, difficulty and age.",
@@ -28,26 +27,144 @@ LANG_TEMPLATES = {
     "ta": "இலக்கு, கடினம் மற்றும் வயதை வைத்து பரிந்துரைகள்.",
 }
 
+# Query text for the known goals; any other goal is matched as free text
+GOAL_QUERIES = {
+    "speech": "speech words sounds articulation vocabulary expressive language",
+    "attention": "attention concentration memory visual listening sequencing",
+    "social": "social emotions turn taking conversation greetings cooperation",
+}
+DEFAULT_GOAL = "attention"
+
+DIFFICULTY_LEVELS = {"easy": 1, "medium": 2, "hard": 3}
+TOP_K = {"easy": 2, "medium": 3, "hard": 4}
+
+# Score weights
+W_GOAL = 1.0
+W_TEXT = 0.6
+W_AGE = 0.5
+W_DIFFICULTY = 0.4
+AGE_FALLOFF_YEARS = 3.0
+
+
+class ActivityModel:
+    def __init__(self, items: List[dict]) -> None:
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.ids = [it["id"] for it in items]
+        self.titles = [it["title"] for it in items]
+        self.goals = sorted({g for it in items for g in it["goals"]})
+        goal_pos = {g: i for i, g in enumerate(self.goals)}
+
+        self.vectorizer = TfidfVectorizer(sublinear_tf=True)
+        self.matrix = self.vectorizer.fit_transform(
+            [" ".join([it["title"], it.get("tags", ""), *it["goals"]]) for it in items]
+        )  # (activities, vocab), rows L2-normalized
+
+        # (goals, activities) membership; row -1 is filled in per free-text goal
+        self.membership = np.zeros((len(self.goals) + 1, len(items)))
+        for j, it in enumerate(items):
+            for g in it["goals"]:
+                self.membership[goal_pos[g], j] = 1.0
+        self.goal_pos = goal_pos
+
+        self.min_age = np.array([it["min_age"] for it in items], dtype=float)
+        self.max_age = np.array([it["max_age"] for it in items], dtype=float)
+        self.difficulty = np.array([it["difficulty"] for it in items], dtype=float)
+
+    def _goal_key(self, goal: str) -> str:
+        goal = (goal or "").strip().lower()
+        return goal or DEFAULT_GOAL
+
+    def scores(self, reqs: Sequence[SuggestRequest]) -> "np.ndarray":
+        """(learners, activities) score matrix."""
+        import numpy as np
+
+        goals = [self._goal_key(r.goal) for r in reqs]
+        queries = self.vectorizer.transform([GOAL_QUERIES.get(g, g) for g in goals])
+        text = (queries @ self.matrix.T).toarray()
+
+        member = self.membership[[self.goal_pos.get(g, -1) for g in goals]]
+        # Free-text goals: best text match stands in for membership,
+        # falling back to the default goal when nothing matches
+        best = text.max(axis=1, initial=0.0)
+        for i, g in enumerate(goals):
+            if g not in self.goal_pos:
+                member[i] = text[i] / best[i] if best[i] > 0 else self.membership[self.goal_pos[DEFAULT_GOAL]]
+
+        age = np.array([r.child_age for r in reqs], dtype=float)[:, None]
+        distance = np.maximum(self.min_age - age, 0) + np.maximum(age - self.max_age, 0)
+        age_fit = np.clip(1.0 - distance / AGE_FALLOFF_YEARS, 0.0, 1.0)
+
+        level = np.array(
+            [DIFFICULTY_LEVELS.get(r.difficulty, 3) for r in reqs], dtype=float
+        )[:, None]
+        difficulty_fit = 1.0 - np.abs(self.difficulty - level) / 2.0
+
+        return W_GOAL * member + W_TEXT * text + W_AGE * age_fit + W_DIFFICULTY * difficulty_fit
+
+    def top_k(self, reqs: Sequence[SuggestRequest]) -> List[List[int]]:
+        import numpy as np
+
+        if not reqs:
+            return []
+        scores = self.scores(reqs)
+        ks = [min(_k_for(r), scores.shape[1]) for r in reqs]
+        kmax = max(ks)
+
+        # Unordered top kmax per row, then order just those columns
+        if kmax < scores.shape[1]:
+            cand = np.argpartition(-scores, kmax - 1, axis=1)[:, :kmax]
+        else:
+            cand = np.tile(np.arange(scores.shape[1]), (len(reqs), 1))
+        cand.sort(axis=1)  # catalogue order breaks score ties
+        cand_scores = np.take_along_axis(scores, cand, axis=1)
+        order = np.argsort(-cand_scores, axis=1, kind="stable")
+        ranked = np.take_along_axis(cand, order, axis=1)
+        return [row[:k].tolist() for row, k in zip(ranked, ks)]
+
+
+def _k_for(req: SuggestRequest) -> int:
+    return req.top_k or TOP_K.get(req.difficulty, TOP_K["hard"])
+
+
+def _duration_suffix(age: int) -> str:
+    if age <= 6:
+        return " (short 5–7 min)"
+    if age <= 10:
+        return " (10 min)"
+    return " (12–15 min)"
+
+
+_lock = threading.Lock()
+_model: Optional[ActivityModel] = None
+
+
+def get_model() -> ActivityModel:
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                items = json.loads(CATALOGUE_PATH.read_text(encoding="utf-8"))
+                _model = ActivityModel(items)
+    return _model
+
+
+def recommend(reqs: Sequence[SuggestRequest]) -> List[dict]:
+    """Ranked activities for a whole caseload, scored in one pass."""
+    model = get_model()
+    return [
+        {
+            "activity_ids": [model.ids[j] for j in row],
+            "suggestions": [model.titles[j] + _duration_suffix(r.child_age) for j in row],
+        }
+        for r, row in zip(reqs, model.top_k(reqs))
+    ]
+
+
 def suggest(req: SuggestRequest) -> List[str]:
-    base = ACTIVITY_BANK.get(req.goal, ACTIVITY_BANK["attention"]).copy()
-
-    # Simple difficulty filter (demo-friendly)
-    if req.difficulty == "easy":
-        base = base[:2]
-    elif req.difficulty == "medium":
-        base = base[:3]
-    else:
-        base = base[:4]
-
-    # Age-based tweak
-    if req.child_age <= 6:
-        base = [b + " (short 5–7 min)" for b in base]
-    elif req.child_age <= 10:
-        base = [b + " (10 min)" for b in base]
-    else:
-        base = [b + " (12–15 min)" for b in base]
-
-    return base
+    return recommend([req])[0]["suggestions"]
+
 
 def rationale(language: str) -> str:
     lang = "en"
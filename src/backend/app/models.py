@@ -1,23 +1,79 @@
-from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from .config import settings
 
 class DatasetInfo(BaseModel):
     name: str
     last_refreshed_utc: Optional[str] = None
+    last_checked_utc: Optional[str] = None
     sample_count_cached: int = 0
+    sample_size: Optional[int] = None
+    fingerprint: Optional[str] = None
     status: str = "unknown"
+    source: Optional[str] = None  # "snapshot" | "fresh"
     error: Optional[str] = None
 
+class DatasetList(BaseModel):
+    datasets: List[DatasetInfo]
+
 class DatasetSample(BaseModel):
     dataset: str
+    offset: int = 0
     rows: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None  # opaque; None on the last page
 
 class SuggestRequest(BaseModel):
     child_age: int
     difficulty: str  # "easy" | "medium" | "hard"
     goal: str        # e.g. "speech" | "attention" | "social"
     language: str    # "en" | "hi" | "ta"
+    top_k: Optional[int] = Field(None, ge=1, le=20)  # default depends on difficulty
 
 class SuggestResponse(BaseModel):
     suggestions: List[str]
+    activity_ids: List[str] = []
     rationale: str
+
+class SuggestBatchRequest(BaseModel):
+    learners: List[SuggestRequest] = Field(..., max_length=1000)
+
+class SuggestBatchResponse(BaseModel):
+    results: List[SuggestResponse]
+
+class ProgressEvent(BaseModel):
+    event_id: str = Field(..., min_length=1, max_length=64)  # client-generated; retries are deduplicated
+    type: Literal["tap", "attempt"]
+    learner_id: str = Field(..., min_length=1, max_length=64)
+    activity_id: str = Field(..., min_length=1, max_length=64)  # "aac-board" for free board taps
+    ts: datetime                       # when it happened on the device (UTC if no offset)
+    item: Optional[str] = Field(None, max_length=200)  # tile concept / card id
+    correct: Optional[bool] = None     # attempts only
+    duration_ms: Optional[int] = Field(None, ge=0, le=3_600_000)
+
+class EventBatch(BaseModel):
+    events: List[ProgressEvent] = Field(..., min_length=1, max_length=settings.EVENTS_BATCH_MAX)
+
+class EventBatchResult(BaseModel):
+    accepted: int
+    duplicates: int
+
+class ProgressCounts(BaseModel):
+    taps: int = 0
+    attempts: int = 0
+    correct: int = 0
+    wrong: int = 0
+    duration_ms: int = 0
+    accuracy: Optional[float] = None   # correct / (correct + wrong), 0..100
+    last_ts: Optional[str] = None
+
+class RollupRow(ProgressCounts):
+    learner_id: str
+    activity_id: str
+    week: str                          # ISO week, e.g. "2026-W42"
+
+class RollupResponse(BaseModel):
+    rows: List[RollupRow]
+    learners: Dict[str, ProgressCounts]  # totals over the returned rows
+
@@ -1,45 +1,72 @@
-from fastapi import APIRouter, Query
-from pathlib import Path
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta, timezone
+import asyncio
 import json
 import random
 import hashlib
 
-from .services_google import translate_text
-from .services_google_images import fetch_image_url
+import threading
+import time
 
-router = APIRouter(prefix="/aac", tags=["AAC"])
+import anyio
 
-# --- Load AAC pool from JSON (data-driven, not hardcoded in code) ---
-POOL_PATH = Path(__file__).parent / "aac_pool.json"
+from .aac_pool import get_pool_index
+from .admission import Overloaded, hydrate_lane, upstream_lane
+from .audio_cache import audio_path, audio_key, get_or_synthesize
+from .cache_store import CacheStore
+from .config import settings
+from .image_proxy import SIZES as IMAGE_SIZES, get_variant, image_response, negotiate_format, pictogram_id, variant_path
+from .metrics import cache_samples, register_collector
+from .timing import span, start_timing
+from .ttl_cache import TTLCache
+from .services_google import translate_texts
+from .singleflight import flight
+from .translation_memory import get_memory, memory_for
+from .services_google_images import fetch_image_url, PLACEHOLDER
 
-def _load_pool() -> dict:
-    if not POOL_PATH.exists():
-        # If missing, return minimal safe pool
-        return {"core": ["I", "you", "help", "want", "more", "stop", "go"]}
-    return json.loads(POOL_PATH.read_text(encoding="utf-8"))
+router = APIRouter(prefix="/aac", tags=["AAC"])
 
-# --- Simple in-memory caches to reduce API hits ---
-_translation_cache: dict[tuple[str, str], str] = {}
-_image_cache: dict[str, str] = {}
+# --- Bounded in-memory caches to reduce API hits ---
+# Fallbacks (untranslated English, placeholder image) are cached with the
+# short negative TTL so a Google/ARASAAC outage is retried soon.
+_translation_cache = TTLCache(
+    maxsize=settings.AAC_CACHE_MAX_ENTRIES,
+    ttl=settings.AAC_CACHE_TTL_S,
+    negative_ttl=settings.AAC_CACHE_NEGATIVE_TTL_S,
+)
+_image_cache = TTLCache(
+    maxsize=settings.AAC_CACHE_MAX_ENTRIES,
+    ttl=settings.AAC_CACHE_TTL_S,
+    negative_ttl=settings.AAC_CACHE_NEGATIVE_TTL_S,
+)
 
 # ✅ bump this when you change image selection logic to bust old cache
-_IMAGE_CACHE_VERSION = "v2"
+_IMAGE_CACHE_VERSION = "v3"  # v3: offline ARASAAC index
+
+# --- Disk cache shared by all workers on the host (behind the caches above) ---
+_store = CacheStore(settings.data_path / settings.AAC_CACHE_DB)
+
+def _image_ns() -> str:
+    return f"img:{_IMAGE_CACHE_VERSION}"
+
+# Supported board languages -> TTS voice
+_TTS_VOICES = {
+    "hi": "hi-IN",
+    "ta": "ta-IN",
+    "te": "te-IN",
+    "kn": "kn-IN",
+    "ml": "ml-IN",
+    "mr": "mr-IN",
+    "bn": "bn-IN",
+    "gu": "gu-IN",
+    "pa": "pa-IN",
+    "ur": "ur-IN",
+    "en": "en-IN",
+}
 
 def _tts_voice_for_lang(lang: str) -> str:
-    return {
-        "hi": "hi-IN",
-        "ta": "ta-IN",
-        "te": "te-IN",
-        "kn": "kn-IN",
-        "ml": "ml-IN",
-        "mr": "mr-IN",
-        "bn": "bn-IN",
-        "gu": "gu-IN",
-        "pa": "pa-IN",
-        "ur": "ur-IN",
-        "en": "en-IN",
-    }.get(lang, "en-IN")
+    return _TTS_VOICES.get(lang, "en-IN")
 
 def _stable_seed(seed: str) -> int:
     """
@@ -56,155 +83,756 @@ def _stable_seed(seed: str) -> int:
     h = hashlib.sha256(seed.encode("utf-8")).hexdigest()
     return int(h[:8], 16)
 
-def _translate(concept: str, lang: str) -> str:
+def _cached_translation(concept: str, lang: str) -> str | None:
+    if lang == "en":
+        return concept
+    # Translation memory first: human wording wins over earlier MT output
+    label = get_memory().lookup(concept, lang)
+    if label is not None:
+        return label
+    return _translation_cache.get((concept.lower().strip(), lang))
+
+def _has_translation(concept: str, lang: str) -> bool:
     """
-    Safe translate wrapper:
-    - Caches results
-    - Doesn't crash if Google fails
-    - Supports multiple possible translate_text() signatures
+    True if a real translation is known (upstream result, disk cache or
+    TM), even one that reads like the English concept (names, loanwords);
+    False for the fallback after a failed translate.
     """
-    key = (concept.lower().strip(), lang)
-    if key in _translation_cache:
-        return _translation_cache[key]
-
     if lang == "en":
-        translated = concept
-    else:
+        return True
+    if _translation_cache.is_positive((concept.lower().strip(), lang)):
+        return True
+    return get_memory().lookup(concept, lang) is not None
+
+def _cached_image(concept: str) -> str | None:
+    return _image_cache.get(f"{_IMAGE_CACHE_VERSION}:{concept.lower().strip()}")
+
+def _fetch_translations(concepts: list[str], lang: str) -> dict[str, str]:
+    """
+    Resolve concepts already known to miss the memory cache.
+    Keys another thread is already fetching are waited on (single-flight);
+    the rest go disk cache first, then one batched upstream call.
+    """
+    groups: dict[tuple[str, str], list[str]] = {}
+    for concept in concepts:
+        groups.setdefault((concept.lower().strip(), lang), []).append(concept)
+
+    led, joined = {}, {}
+    for key in groups:
+        call, leader = flight.claim(("tr", *key))
+        (led if leader else joined)[key] = call
+
+    labels: dict[tuple[str, str], str] = {}
+    if led:
         try:
-            # Try common signatures (your project may use any one of these)
-            try:
-                translated = translate_text(concept, lang)  # (text, lang)
-            except TypeError:
-                try:
-                    translated = translate_text(concept, target_lang=lang)  # (text, target_lang)
-                except TypeError:
-                    translated = translate_text(concept, target_language=lang)  # (text, target_language)
-        except Exception:
-            translated = concept  # fallback (never crash)
-
-    _translation_cache[key] = translated
-    return translated
-
-def _image(concept: str) -> str:
-    """
-    ✅ Fixed image fetching:
-    - Cache-bust with version
-    - Calls fetch_image_url(concept) (NOT query strings)
-    - Doesn't lock you into repeated "random" results
-    """
-    key = f"{_IMAGE_CACHE_VERSION}:{concept.lower().strip()}"
-    if key in _image_cache:
-        return _image_cache[key]
-
-    url = fetch_image_url(concept)  # ✅ only concept
-    _image_cache[key] = url
+            labels = _resolve_translations({k: groups[k][0] for k in led}, lang)
+        except BaseException as e:
+            for key, call in led.items():
+                flight.resolve(("tr", *key), call, error=e)
+            raise
+        for key, call in led.items():
+            flight.resolve(("tr", *key), call, value=labels[key])
+
+    for key, call in joined.items():
+        labels[key] = flight.wait(call)
+
+    # Fan each result back to every spelling of that concept in this request
+    return {concept: labels[key] for key, cs in groups.items() for concept in cs}
+
+def _resolve_translations(texts: dict[tuple[str, str], str], lang: str) -> dict[tuple[str, str], str]:
+    out: dict[tuple[str, str], str] = {}
+
+    # A lookup queued behind an earlier flight for the same key finds its
+    # result here, fallbacks (negative entries) included
+    for key in list(texts):
+        cached = _translation_cache.get(key)
+        if cached is not None:
+            out[key] = cached
+            del texts[key]
+
+    # Another worker may already have paid for these
+    stored = get_memory().load_stored("en", lang, texts.values())
+    for key, text in list(texts.items()):
+        if text in stored:
+            out[key] = stored[text]
+            _translation_cache.set(key, out[key])
+            del texts[key]
+
+    if not texts:
+        return out
+
+    # One upstream text per normalized key
+    keys = list(texts.keys())
+    originals = [texts[k] for k in keys]
+    try:
+        translated = translate_texts(originals, lang)
+        ok = True
+    except Overloaded:
+        raise  # shed load: tiles stay pending, nothing is cached
+    except Exception:
+        translated = originals  # fallback (never crash)
+        ok = False
+
+    for key, label in zip(keys, translated):
+        _translation_cache.set(key, label, negative=not ok)
+        out[key] = label
+
+    if ok:
+        # Persisted by the translation memory (tm:mt:en:<lang>)
+        get_memory().remember("en", lang, dict(zip(originals, translated)))
+    return out
+
+def _fetch_image(concept: str) -> str:
+    """
+    Resolve a concept already known to miss the memory cache:
+    disk cache first, then the upstream image search.
+    Concurrent misses for the same concept share one lookup.
+    """
+    norm = concept.lower().strip()
+    return flight.do(("img", _IMAGE_CACHE_VERSION, norm), _resolve_image, concept, norm)
+
+def _resolve_image(concept: str, norm: str) -> str:
+    key = f"{_IMAGE_CACHE_VERSION}:{norm}"
+    # A lookup queued behind an earlier flight finds its result here,
+    # placeholders (negative entries) included
+    url = _image_cache.get(key)
+    if url is not None:
+        return url
+    url = _store.get(_image_ns(), norm)
+    if url is None:
+        url = fetch_image_url(concept)  # ✅ only concept
+        if url != PLACEHOLDER:
+            _store.set(_image_ns(), norm, url)
+
+    _image_cache.set(key, url, negative=url == PLACEHOLDER)
     return url
 
-def _pick_unique(concepts: list[str], limit: int) -> list[str]:
-    """De-dupe while preserving order."""
-    seen = set()
-    unique = []
-    for w in concepts:
-        k = w.lower().strip()
-        if k not in seen:
-            seen.add(k)
-            unique.append(w)
-        if len(unique) >= limit:
+def _load_from_store(
+    label_misses: list[str], image_misses: list[str], lang: str
+) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Pull a whole request's worth of labels and images from the disk cache
+    into memory: one query per namespace instead of one per tile.
+    Returns ({normalized: label}, {normalized: image_url}) for the hits.
+    """
+    labels: dict[str, str] = {}
+    if label_misses:
+        stored = get_memory().load_stored("en", lang, label_misses)
+        for concept, label in stored.items():
+            norm = concept.lower().strip()
+            labels[norm] = label
+            _translation_cache.set((norm, lang), label)
+
+    images: dict[str, str] = {}
+    if image_misses:
+        norms = list({c.lower().strip() for c in image_misses})
+        images = _store.get_many(_image_ns(), norms)
+        for norm, url in images.items():
+            _image_cache.set(f"{_IMAGE_CACHE_VERSION}:{norm}", url)
+
+    return labels, images
+
+# -----------------------------
+# Async tile hydration
+# -----------------------------
+# Lookups that outlive a request deadline keep running so they still land
+# in the caches; hold references so they are not garbage collected.
+_background_lookups: set[asyncio.Task] = set()
+
+# Pending lookup per key ("img", norm) / ("tr", lang, norm): concurrent
+# requests missing on the same key share one task instead of each
+# spawning (and queueing) their own
+_inflight: dict[tuple, asyncio.Task] = {}
+
+def _timed(phase: str, fn, *args):
+    # Runs in the worker thread, which inherits the request's timing context
+    with span(phase):
+        return fn(*args)
+
+def _spawn_lookup(phase: str, fn, *args) -> asyncio.Task:
+    # Raises Overloaded (503) when the hydrate lane is full
+    task = hydrate_lane.spawn(_timed, phase, fn, *args)
+    _background_lookups.add(task)
+    task.add_done_callback(_lookup_done)
+    return task
+
+def _share(key: tuple, task: asyncio.Task) -> None:
+    _inflight[key] = task
+    task.add_done_callback(lambda t: _inflight.pop(key, None) if _inflight.get(key) is t else None)
+
+def _fetch_labels(concepts: list[str], lang: str) -> dict[str, str]:
+    """_fetch_translations keyed by normalized concept (shared between requests)."""
+    return {c.lower().strip(): label for c, label in _fetch_translations(concepts, lang).items()}
+
+def _lookup_done(task: asyncio.Task) -> None:
+    _background_lookups.discard(task)
+    # Late failures (e.g. Overloaded after the deadline) are expected:
+    # mark them retrieved so asyncio doesn't log them
+    if not task.cancelled():
+        task.exception()
+
+def _resolved(value, fallback):
+    """(result, ok) of a cached value or a lookup task; fallback if not done/failed."""
+    if not isinstance(value, asyncio.Task):
+        return value, True
+    if value.done() and not value.cancelled() and value.exception() is None:
+        return value.result(), True
+    return fallback, False
+
+class _Hydration:
+    """
+    Labels and images for one request's concepts.
+    - Memory hits are used directly (no thread hop); memory misses are
+      bulk-read from the shared disk cache first
+    - Misses run in the hydrate lane (AAC_HYDRATE_CONCURRENCY threads);
+      start() raises Overloaded when it is full, before any response is sent
+    - A tile whose lookups aren't done yet is "pending" (English label /
+      placeholder image); the lookup keeps running and fills the cache
+      for the next request
+    """
+
+    def __init__(self, concepts: list[str], lang: str, image_url=None) -> None:
+        self.concepts = concepts
+        self.lang = lang
+        self.image_url = image_url  # optional rewrite of resolved image URLs
+        self.tts_lang = _tts_voice_for_lang(lang)
+        self.labels: dict[str, str] = {}
+        self.images: dict[str, str | asyncio.Task] = {}
+        self.label_tasks: dict[str, asyncio.Task] = {}  # concept -> {norm: label} task
+        self.started_at = 0.0
+
+    async def start(self) -> None:
+        concepts, lang = self.concepts, self.lang
+        self.started_at = asyncio.get_running_loop().time()
+        await memory_for(lang)  # first use of a language: load it off the loop
+        label_misses: list[str] = []
+        image_misses: list[str] = []
+
+        for concept in concepts:
+            label = _cached_translation(concept, lang)
+            if label is None:
+                label_misses.append(concept)
+            else:
+                self.labels[concept] = label
+
+            image = _cached_image(concept)
+            if image is None:
+                image_misses.append(concept)
+            else:
+                self.images[concept] = image
+
+        if label_misses or image_misses:
+            with span("store"):
+                stored_labels, stored_images = await anyio.to_thread.run_sync(
+                    _load_from_store, label_misses, image_misses, lang
+                )
+            label_misses = [c for c in label_misses if c.lower().strip() not in stored_labels]
+            image_misses = [c for c in image_misses if c.lower().strip() not in stored_images]
+            for concept in concepts:
+                norm = concept.lower().strip()
+                if norm in stored_labels:
+                    self.labels[concept] = stored_labels[norm]
+                if norm in stored_images:
+                    self.images[concept] = stored_images[norm]
+
+        for concept in image_misses:
+            key = ("img", concept.lower().strip())
+            task = _inflight.get(key)
+            if task is None:
+                task = _spawn_lookup("image", _fetch_image, concept)
+                _share(key, task)
+            self.images[concept] = task
+
+        new_labels = []
+        for concept in label_misses:
+            task = _inflight.get(("tr", lang, concept.lower().strip()))
+            if task is None:
+                new_labels.append(concept)
+            else:
+                self.label_tasks[concept] = task
+        if new_labels:
+            # All label misses nobody is fetching yet go upstream as one batch
+            task = _spawn_lookup("translate", _fetch_labels, new_labels, lang)
+            for concept in new_labels:
+                _share(("tr", lang, concept.lower().strip()), task)
+                self.label_tasks[concept] = task
+
+    @property
+    def tasks(self) -> list[asyncio.Task]:
+        tasks = {v for v in self.images.values() if isinstance(v, asyncio.Task)}
+        tasks.update(self.label_tasks.values())
+        return list(tasks)
+
+    def _merge_labels(self) -> None:
+        for concept, task in list(self.label_tasks.items()):
+            if task.done():
+                batch, ok = _resolved(task, {})
+                label = batch.get(concept.lower().strip()) if ok else None
+                if label is not None:
+                    self.labels[concept] = label
+                del self.label_tasks[concept]
+
+    def is_done(self, concept: str) -> bool:
+        """True once nothing is left to wait for (success or failure)."""
+        self._merge_labels()
+        image = self.images[concept]
+        if isinstance(image, asyncio.Task) and not image.done():
+            return False
+        return concept not in self.label_tasks
+
+    def tile(self, concept: str) -> dict:
+        self._merge_labels()
+        label_ok = concept in self.labels
+        image_url, image_ok = _resolved(self.images[concept], PLACEHOLDER)
+        if self.image_url is not None:
+            image_url = self.image_url(image_url)
+        return {
+            "concept": concept,
+            "label": self.labels.get(concept, concept),
+            "image_url": image_url,
+            "tts_lang": self.tts_lang,
+            "status": "ready" if label_ok and image_ok else "pending",
+        }
+
+async def _start_hydration(concepts: list[str], lang: str, image_url=None) -> _Hydration:
+    hydration = _Hydration(concepts, lang, image_url)
+    await hydration.start()
+    return hydration
+
+async def _hydrate_tiles(concepts: list[str], lang: str, deadline_ms: int, image_url=None) -> list[dict]:
+    """
+    Resolve labels and images for all concepts in parallel (see _Hydration).
+    Anything not done by the deadline comes back as a "pending" tile.
+    """
+    hydration = await _start_hydration(concepts, lang, image_url)
+
+    tasks = hydration.tasks
+    if tasks:
+        # asyncio.wait never cancels: late lookups still finish in the background
+        await asyncio.wait(tasks, timeout=deadline_ms / 1000)
+
+    return [hydration.tile(concept) for concept in concepts]
+
+async def _stream_tiles(hydration: _Hydration, deadline_ms: int):
+    """
+    Like _hydrate_tiles, but for a started hydration (so a full lane is a
+    503, not a broken stream); yields (position, tile) as each tile is done:
+    cached tiles first, then the others as their lookups finish, then
+    whatever is still unresolved at the deadline as "pending".
+    """
+    loop = asyncio.get_running_loop()
+    deadline = hydration.started_at + deadline_ms / 1000
+
+    remaining = dict(enumerate(hydration.concepts))
+    while remaining:
+        done = [i for i, concept in remaining.items() if hydration.is_done(concept)]
+        for i in done:
+            yield i, hydration.tile(remaining.pop(i))
+
+        waiting = [t for t in hydration.tasks if not t.done()]
+        timeout = deadline - loop.time()
+        if not remaining or not waiting or timeout <= 0:
             break
-    return unique
+        await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+    for i, concept in sorted(remaining.items()):
+        yield i, hydration.tile(concept)
+
+def _image_url_rewriter(request: Request, images: str, image_size: int):
+    """
+    images=proxy: point ARASAAC tiles at /aac/image/{id} (resized, cached
+    on this server); other URLs (Custom Search, placeholder) pass through.
+    """
+    if images != "proxy":
+        return None
+    if image_size not in IMAGE_SIZES:
+        raise HTTPException(status_code=422, detail=f"image_size must be one of {list(IMAGE_SIZES)}")
+
+    def rewrite(url: str) -> str:
+        pic_id = pictogram_id(url)
+        if pic_id is None:
+            return url
+        return f"{request.url_for('aac_image', pictogram_id=str(pic_id))}?size={image_size}"
+    return rewrite
+
+def _wants_stream(request: Request, stream: bool) -> bool:
+    return stream or "application/x-ndjson" in request.headers.get("accept", "")
+
+def _ndjson(record: dict) -> bytes:
+    return _encode_json(record) + b"\n"
+
+# Tell nginx-style proxies not to buffer the stream
+_STREAM_HEADERS = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+
+def _summary(tiles: list[dict], **extra) -> dict:
+    return {
+        "type": "summary",
+        **extra,
+        "count": len(tiles),
+        "pending": sum(1 for t in tiles if t["status"] == "pending"),
+        "placeholders": [t["concept"] for t in tiles if t["image_url"] == PLACEHOLDER],
+    }
+
+# -----------------------------
+# Cache warm-up (run by the scheduler)
+# -----------------------------
+_warmup_lock = threading.Lock()
+
+WARMUP: dict = {
+    "status": "idle",   # idle | running | done | error
+    "started_utc": None,
+    "finished_utc": None,
+    "pool_version": None,
+    "concepts": 0,
+    "upstream_calls": 0,
+    "error": None,
+    "coverage": {},     # lang -> {"labels": n, "images": n, "tts": n}
+}
+
+class _Pacer:
+    """Spaces out upstream calls to stay within a calls-per-second budget."""
+
+    def __init__(self, rate_per_s: float) -> None:
+        self.interval = 1.0 / rate_per_s if rate_per_s > 0 else 0.0
+        self.next_at = time.monotonic()
+        self.calls = 0
+
+    def wait(self) -> None:
+        now = time.monotonic()
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
+        self.calls += 1
+
+def _retry_shed(fn, *args, attempts: int = 5):
+    """Warm-up is background work: wait out admission rejections."""
+    for attempt in range(attempts):
+        try:
+            return fn(*args)
+        except Overloaded as e:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(e.retry_after_s)
+
+def warm_aac_pool(include_tts: bool | None = None) -> dict:
+    """
+    Fill translation and image caches (and optionally TTS audio) for every
+    concept in the pool and every supported language, within
+    AAC_WARMUP_RATE_PER_S upstream calls per second.
+    Only one warm-up runs at a time; a second call returns immediately.
+    """
+    if include_tts is None:
+        include_tts = settings.AAC_WARMUP_TTS
+    if not _warmup_lock.acquire(blocking=False):
+        return WARMUP
+
+    try:
+        index = get_pool_index()
+        concepts = list(index.all_concepts())
+        pace = _Pacer(settings.AAC_WARMUP_RATE_PER_S)
+        WARMUP.update(
+            status="running",
+            started_utc=datetime.now(timezone.utc).isoformat(),
+            finished_utc=None,
+            pool_version=index.version,
+            concepts=len(concepts),
+            upstream_calls=0,
+            error=None,
+            coverage={},
+        )
+
+        # Images don't depend on language: resolve once
+        _, stored_images = _load_from_store([], concepts, "en")
+        images_ok = 0
+        for concept in concepts:
+            url = stored_images.get(concept.lower().strip()) or _cached_image(concept)
+            if url is None:
+                pace.wait()
+                url = _retry_shed(_fetch_image, concept)
+            images_ok += url != PLACEHOLDER
+
+        for lang in _TTS_VOICES:
+            labels: dict[str, str] = {c: c for c in concepts} if lang == "en" else {}
+            if lang != "en":
+                labels = {c: label for c in concepts if (label := _cached_translation(c, lang)) is not None}
+                stored, _ = _load_from_store([c for c in concepts if c not in labels], [], lang)
+                labels.update({c: stored[c.lower().strip()] for c in concepts if c not in labels and c.lower().strip() in stored})
+                misses = [c for c in concepts if c not in labels]
+                for i in range(0, len(misses), 100):
+                    pace.wait()
+                    labels.update(_retry_shed(_fetch_translations, misses[i:i + 100], lang))
+
+            tts_ok = 0
+            if include_tts:
+                voice = _tts_voice_for_lang(lang)
+                for concept in concepts:
+                    label = labels[concept]
+                    if not audio_path(audio_key(label, voice)).exists():
+                        pace.wait()
+                        try:
+                            get_or_synthesize(label, voice)
+                        except Exception:
+                            continue
+                    tts_ok += 1
+
+            WARMUP["upstream_calls"] = pace.calls
+            # A failed translate falls back to the English concept: not covered
+            translated = sum(_has_translation(c, lang) for c in concepts)
+            WARMUP["coverage"][lang] = {
+                "labels": translated,
+                "images": images_ok,
+                "tts": tts_ok,
+            }
+
+        WARMUP["status"] = "done"
+    except Exception as e:
+        WARMUP["status"] = "error"
+        WARMUP["error"] = str(e)
+    finally:
+        WARMUP["finished_utc"] = datetime.now(timezone.utc).isoformat()
+        _warmup_lock.release()
+    return WARMUP
+
+@router.get("/warmup")
+def get_warmup_status():
+    return WARMUP
+
+# -----------------------------
+# Cache stats (hit/miss/eviction counters)
+# -----------------------------
+@router.get("/cache/stats")
+def get_cache_stats():
+    return {
+        "translation": _translation_cache.stats(),
+        "image": _image_cache.stats(),
+        "singleflight": flight.stats(),
+    }
 
 # -----------------------------
 # Categories endpoint (for chips)
 # -----------------------------
 @router.get("/categories")
 def get_categories():
-    pool = _load_pool()
-    return {"categories": sorted(list(pool.keys()))}
+    return {"categories": list(get_pool_index().sorted_categories)}
 
 # -----------------------------
 # symbols list endpoint
 # -----------------------------
 @router.get("/symbols")
-def get_symbols(
+async def get_symbols(
+    request: Request,
     lang: str = Query("en", description="Language code like en, hi, ta"),
     limit: int = Query(50, ge=1, le=500),
     cats: str | None = Query(None, description="Comma-separated categories"),
+    deadline_ms: int = Query(
+        settings.AAC_HYDRATE_DEADLINE_MS, ge=0, le=60000,
+        description="Return unresolved items as pending after this many ms",
+    ),
+    stream: bool = Query(False, description="NDJSON: one line per item as it resolves, then a summary"),
+    images: str = Query(settings.AAC_IMAGE_URLS, pattern="^(upstream|proxy)$"),
+    image_size: int = Query(settings.AAC_IMAGE_DEFAULT_SIZE, description="Proxy image size (96, 128, 256)"),
 ):
-    pool = _load_pool()
-
-    selected_cats = list(pool.keys())
-    if cats:
-        requested = [c.strip() for c in cats.split(",") if c.strip()]
-        selected_cats = [c for c in requested if c in pool] or selected_cats
-
-    # Flatten
-    concepts: list[str] = []
-    for c in selected_cats:
-        concepts.extend(pool.get(c, []))
-
-    unique = _pick_unique(concepts, limit)
-
-    items = []
-    for idx, concept in enumerate(unique, start=1):
-        items.append(
-            {
-                "id": str(idx),
-                "concept": concept,
-                "label": _translate(concept, lang),
-                "image_url": _image(concept),
-                "tts_lang": _tts_voice_for_lang(lang),
-            }
+    image_url = _image_url_rewriter(request, images, image_size)
+    timing = start_timing()
+    with timing.span("pool"):
+        index = get_pool_index()
+
+        requested = [c.strip() for c in cats.split(",") if c.strip()] if cats else []
+        selected_cats = index.resolve_categories(requested)
+
+        # De-duped candidates are precomputed per category combination
+        unique = list(index.candidates(tuple(selected_cats))[:limit])
+
+    if _wants_stream(request, stream):
+        hydration = await _start_hydration(unique, lang, image_url)
+        return StreamingResponse(
+            _symbols_stream(hydration, deadline_ms),
+            media_type="application/x-ndjson",
+            headers=_STREAM_HEADERS,
         )
 
-    return {"lang": lang, "count": len(items), "items": items}
+    hydrated = await _hydrate_tiles(unique, lang, deadline_ms, image_url)
+
+    with timing.span("serialize"):
+        items = [{"id": str(idx), **item} for idx, item in enumerate(hydrated, start=1)]
+        pending = sum(1 for it in items if it["status"] == "pending")
+        body = _encode_json({"lang": lang, "count": len(items), "pending": pending, "items": items})
+    return _with_timing(Response(content=body, media_type="application/json"), timing)
+
+async def _symbols_stream(hydration: _Hydration, deadline_ms: int):
+    items = [None] * len(hydration.concepts)
+    async for i, item in _stream_tiles(hydration, deadline_ms):
+        items[i] = item = {"id": str(i + 1), **item}
+        yield _ndjson({"type": "tile", "index": i, **item})
+    yield _ndjson(_summary(items, lang=hydration.lang))
+
+# -----------------------------
+# Board response cache (deterministic seeds only)
+# -----------------------------
+# (lang, size, cats, seed, utc-day, pool version) -> (json bytes, etag)
+_board_cache = TTLCache(
+    maxsize=settings.AAC_BOARD_CACHE_MAX_ENTRIES,
+    ttl=settings.AAC_CACHE_TTL_S,
+    negative_ttl=0,
+)
+
+register_collector("aac_caches", lambda: cache_samples({
+    "translation": _translation_cache,
+    "image": _image_cache,
+    "board": _board_cache,
+}))
+
+def _with_timing(response: Response, timing) -> Response:
+    response.headers["Server-Timing"] = timing.header()
+    return response
+
+def _encode_json(payload: dict) -> bytes:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _board_is_final(tiles: list[dict], lang: str) -> bool:
+    """
+    Only cache boards with no pending tiles and no fallbacks (placeholder
+    image / untranslated label); those get retried on the next request.
+    """
+    for t in tiles:
+        if t["status"] != "ready" or t["image_url"] == PLACEHOLDER:
+            return False
+        if not _has_translation(t["concept"], lang):
+            return False
+    return True
+
+def _seconds_to_utc_midnight() -> int:
+    now = datetime.now(timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(1, int((midnight - now).total_seconds()))
+
+def _board_response(request: Request, body: bytes, etag: str, seed: str) -> Response:
+    max_age = _seconds_to_utc_midnight() if seed == "today" else settings.AAC_BOARD_MAX_AGE_S
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    inm = request.headers.get("if-none-match")
+    if inm and etag in [t.strip() for t in inm.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 # -----------------------------
 # board endpoint (changing board)
 # -----------------------------
 @router.get("/board")
-def get_board(
+async def get_board(
+    request: Request,
     lang: str = Query("en"),
     size: int = Query(25, ge=4, le=60),
     cats: str = Query("core,indian_food,actions,feelings"),
     seed: str = Query("today", description="today | random | any-string"),
+    deadline_ms: int = Query(
+        settings.AAC_HYDRATE_DEADLINE_MS, ge=0, le=60000,
+        description="Return unresolved tiles as pending after this many ms",
+    ),
+    stream: bool = Query(False, description="NDJSON: one line per tile as it resolves, then a summary"),
+    images: str = Query(settings.AAC_IMAGE_URLS, pattern="^(upstream|proxy)$"),
+    image_size: int = Query(settings.AAC_IMAGE_DEFAULT_SIZE, description="Proxy image size (96, 128, 256)"),
 ):
-    pool = _load_pool()
-
-    requested_cats = [c.strip() for c in cats.split(",") if c.strip()]
-    available_cats = [c for c in requested_cats if c in pool]
-    if not available_cats:
-        available_cats = list(pool.keys())
-
-    # Build candidate list
-    candidates: list[str] = []
-    for c in available_cats:
-        candidates.extend(pool.get(c, []))
-
-    # De-dupe first (before shuffle)
-    deduped = _pick_unique(candidates, 2000)
-
-    # Shuffle using stable seed
-    rnd = random.Random(_stable_seed(seed))
-    rnd.shuffle(deduped)
-
-    chosen = deduped[:size]
-
-    tiles = []
-    for i, concept in enumerate(chosen):
-        tiles.append(
-            {
-                "id": f"tile_{i+1}",
-                "concept": concept,
-                "label": _translate(concept, lang),
-                "image_url": _image(concept),
-                "tts_lang": _tts_voice_for_lang(lang),
-            }
-        )
+    image_url = _image_url_rewriter(request, images, image_size)
+    timing = start_timing()
+    with timing.span("pool"):
+        index = get_pool_index()
+
+        requested_cats = [c.strip() for c in cats.split(",") if c.strip()]
+        available_cats = index.resolve_categories(requested_cats)
+
+        # Deterministic boards are served from pre-encoded bytes
+        cache_key = None
+        day = None
+        cached = None
+        if seed != "random":
+            day = datetime.utcnow().strftime("%Y-%m-%d") if seed == "today" else None
+            # Proxy URLs are absolute, so they depend on the host they were built for
+            image_variant = (image_size, str(request.base_url)) if image_url else None
+            cache_key = (lang, size, tuple(available_cats), seed, day, index.version, image_variant)
+            cached = _board_cache.get(cache_key)
 
+        if cached is None:
+            # De-duped candidates (before shuffle); copy since the index is shared
+            deduped = list(index.candidates(tuple(available_cats))[:2000])
+
+            # Shuffle using stable seed
+            rnd = random.Random(_stable_seed(day or seed))
+            rnd.shuffle(deduped)
+
+            chosen = deduped[:size]
+
+    meta = {"lang": lang, "size": size, "cats": available_cats, "seed": seed}
+
+    if _wants_stream(request, stream):
+        if cached is not None:
+            body = _replay_board_stream(json.loads(cached[0]), meta)
+        else:
+            hydration = await _start_hydration(chosen, lang, image_url)
+            body = _board_stream(hydration, deadline_ms, meta, cache_key)
+        return StreamingResponse(body, media_type="application/x-ndjson", headers=_STREAM_HEADERS)
+
+    if cached is not None:
+        return _with_timing(_board_response(request, *cached, seed), timing)
+
+    hydrated = await _hydrate_tiles(chosen, lang, deadline_ms, image_url)
+
+    with timing.span("serialize"):
+        tiles = [{"id": f"tile_{i+1}", **tile} for i, tile in enumerate(hydrated)]
+        body = _encode_json(_board_payload(meta, tiles))
+
+    if cache_key is None or not _board_is_final(tiles, lang):
+        response = Response(content=body, media_type="application/json", headers={"Cache-Control": "no-store"})
+        return _with_timing(response, timing)
+
+    etag = _cache_board(cache_key, body)
+    return _with_timing(_board_response(request, body, etag, seed), timing)
+
+def _board_payload(meta: dict, tiles: list[dict]) -> dict:
     return {
-        "lang": lang,
-        "size": size,
-        "cats": available_cats,
-        "seed": seed,
+        **meta,
+        "pending": sum(1 for t in tiles if t["status"] == "pending"),
         "tiles": tiles,
     }
+
+def _cache_board(cache_key: tuple, body: bytes) -> str:
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    _board_cache.set(cache_key, (body, etag))
+    return etag
+
+async def _board_stream(hydration: _Hydration, deadline_ms: int, meta: dict, cache_key):
+    tiles = [None] * len(hydration.concepts)
+    async for i, tile in _stream_tiles(hydration, deadline_ms):
+        tiles[i] = tile = {"id": f"tile_{i+1}", **tile}
+        yield _ndjson({"type": "tile", "index": i, **tile})
+    yield _ndjson(_summary(tiles, **meta))
+
+    # A complete stream fills the board cache just like a JSON response
+    if cache_key is not None and _board_is_final(tiles, hydration.lang):
+        _cache_board(cache_key, _encode_json(_board_payload(meta, tiles)))
+
+async def _replay_board_stream(payload: dict, meta: dict):
+    for i, tile in enumerate(payload["tiles"]):
+        yield _ndjson({"type": "tile", "index": i, **tile})
+    yield _ndjson(_summary(payload["tiles"], **meta))
+
+# -----------------------------
+# Pictogram proxy (resized, cached on disk)
+# -----------------------------
+@router.get("/image/{pictogram_id}", name="aac_image")
+async def get_image(
+    request: Request,
+    pictogram_id: int,
+    size: int = Query(settings.AAC_IMAGE_DEFAULT_SIZE, description="96, 128 or 256"),
+    format: str | None = Query(None, pattern="^(webp|png)$", description="Default: webp if accepted, else png"),
+):
+    if size not in IMAGE_SIZES:
+        raise HTTPException(status_code=422, detail=f"size must be one of {list(IMAGE_SIZES)}")
+    if pictogram_id <= 0:
+        raise HTTPException(status_code=404, detail="Unknown pictogram")
+    fmt = negotiate_format(request, format)
+    path = variant_path(pictogram_id, size, fmt)
+    if not path.exists():
+        path = await upstream_lane.run(get_variant, pictogram_id, size, fmt)
+    return image_response(request, pictogram_id, size, fmt, path, negotiated=format is None)
@@ -1,22 +1,44 @@
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from .config import settings
+from .datasets import list_datasets as list_cached_datasets, search_samples
+from .dataset_index import StaleCursor
+from .models import DatasetList, DatasetSample
 
 router = APIRouter()
 
-@router.get("/datasets")
+@router.get("/datasets", response_model=DatasetList)
 def list_datasets():
-    return {
-        "datasets": [
-            {
-                "name": "AAC Symbols",
-                "status": "ready",
-                "sample_count_cached": 1200,
-                "last_refreshed_utc": "2025-01-01T10:00:00Z",
-            },
-            {
-                "name": "Speech Prompts",
-                "status": "ready",
-                "sample_count_cached": 540,
-                "last_refreshed_utc": "2025-01-01T10:00:00Z",
-            },
-        ]
-    }
+    return {"datasets": list_cached_datasets()}
+
+def _parse_filters(raw: List[str]) -> dict:
+    filters = {}
+    for item in raw:
+        field, sep, value = item.partition(":")
+        if not sep or not field:
+            raise HTTPException(status_code=400, detail=f"Filter must be field:value, got {item!r}")
+        if field in filters:
+            raise HTTPException(status_code=400, detail=f"Only one filter per field: {field}")
+        filters[field] = value
+    return filters
+
+@router.get("/datasets/{name:path}/samples", response_model=DatasetSample)
+def dataset_samples(
+    name: str,
+    limit: int = Query(25, ge=1, le=500),
+    offset: int = Query(0, ge=0, description="Matches to skip (ignored with a cursor)"),
+    filters: List[str] = Query([], alias="filter", description='Field filters, e.g. "label:3" (repeatable, all must match)'),
+    q: Optional[str] = Query(None, max_length=200, description="Keywords; rows must contain all of them"),
+    cursor: Optional[str] = Query(None, max_length=512, description="next_cursor of the previous page"),
+):
+    if name not in settings.hf_datasets_list:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset: {name}")
+    try:
+        page = search_samples(name, _parse_filters(filters), q, cursor, limit, offset)
+    except StaleCursor as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"dataset": name, "offset": 0 if cursor else offset, **page}
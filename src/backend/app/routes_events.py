@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+
+from .events import event_log
+from .models import EventBatch, EventBatchResult, RollupResponse
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+@router.post("", response_model=EventBatchResult)
+async def ingest_events(batch: EventBatch):
+    """
+    Batched AAC taps and activity attempts. Answered once the batch is in
+    the append-only log and the rollups; resending a batch (same event_id
+    values) is safe, repeats count as duplicates.
+    """
+    return await event_log.submit([e.model_dump(mode="json") for e in batch.events])
+
+@router.get("/rollups", response_model=RollupResponse)
+def progress_rollups(
+    learner_id: List[str] = Query([], max_length=1000, description="Repeatable; all learners if omitted"),
+    activity_id: Optional[str] = Query(None),
+    weeks: Optional[int] = Query(None, ge=1, le=520, description="Only the last N ISO weeks"),
+):
+    """Per-(learner, activity, week) progress plus per-learner totals, in one read."""
+    return event_log.rollups(learner_id, activity_id, weeks)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter
-from fastapi.responses import Response
-from pydantic import BaseModel
-from .services_google import translate_text, synthesize_speech_mp3
+import anyio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+from .admission import upstream_lane
+from .audio_cache import audio_archive, audio_response, cached_audio, get_or_synthesize, synthesize_many
+from .config import settings
+from .translation_memory import memory_for, translate_misses
 
 router = APIRouter(prefix="/i18n")
 
@@ -10,16 +13,91 @@ class TranslateReq(BaseModel):
     targetLang: str   # "hi" or "ta" or "en"
     sourceLang: str | None = "en"
 
+# Routes are async: cache hits are answered on the event loop and only
+# misses take a thread from the upstream lane (see admission.py).
+# Translations check the translation memory before Google.
+
 @router.post("/translate")
-def translate(req: TranslateReq):
-    out = translate_text(req.text, req.targetLang, req.sourceLang or "en")
+async def translate(req: TranslateReq):
+    source = req.sourceLang or "en"
+    memory = await memory_for(req.targetLang, source)
+    out = memory.lookup(req.text, req.targetLang, source)
+    if out is None:
+        translated = await upstream_lane.run(translate_misses, [req.text], req.targetLang, source)
+        out = translated[req.text]
     return {"translatedText": out}
 
+class TranslateBatchReq(BaseModel):
+    texts: list[str] = Field(..., max_length=1000)
+    targetLang: str
+    sourceLang: str | None = "en"
+
+@router.post("/translate/batch")
+async def translate_batch(req: TranslateBatchReq):
+    source = req.sourceLang or "en"
+    memory = await memory_for(req.targetLang, source)
+    out = [memory.lookup(t, req.targetLang, source) for t in req.texts]
+    missing = [t for t, hit in zip(req.texts, out) if hit is None]
+    if missing:
+        translated = await upstream_lane.run(translate_misses, missing, req.targetLang, source)
+        out = [hit if hit is not None else translated[t] for t, hit in zip(req.texts, out)]
+    return {"translatedTexts": out}
+
 class TtsReq(BaseModel):
     text: str
     lang: str  # "hi-IN" or "ta-IN" or "en-US"
 
+async def _audio(text: str, voice: str):
+    return cached_audio(text, voice) or await upstream_lane.run(get_or_synthesize, text, voice)
+
 @router.post("/tts")
-def tts(req: TtsReq):
-    audio_bytes = synthesize_speech_mp3(req.text, req.lang)
-    return Response(content=audio_bytes, media_type="audio/mpeg")
+async def tts(req: TtsReq, request: Request):
+    key, path = await _audio(req.text, req.lang)
+    return audio_response(request, key, path)
+
+@router.get("/tts")
+async def tts_get(
+    request: Request,
+    text: str = Query(..., min_length=1, max_length=5000),
+    lang: str = Query(..., description='"hi-IN", "ta-IN", "en-IN" ...'),
+):
+    """
+    Cacheable variant of POST /tts for browsers and CDNs
+    (ETag, long Cache-Control, Range).
+    """
+    key, path = await _audio(text, lang)
+    return audio_response(request, key, path)
+
+class TtsBatchItem(BaseModel):
+    text: str = Field(..., min_length=1, max_length=5000)
+    lang: str
+
+class TtsBatchReq(BaseModel):
+    items: list[TtsBatchItem] = Field(..., min_length=1, max_length=settings.TTS_BATCH_MAX_ITEMS)
+
+def _tts_archive(items: list[tuple[str, str]]) -> bytes:
+    manifest = synthesize_many(items)
+    if all(e["status"] == "error" for e in manifest):
+        raise HTTPException(status_code=502, detail="Text-to-speech failed")
+    return audio_archive(manifest)
+
+@router.post("/tts/batch")
+async def tts_batch(req: TtsBatchReq):
+    """
+    Audio for a whole board in one round trip: a zip with one MP3 per
+    distinct (text, lang) and index.json mapping items to files.
+    Items that fail to synthesize are listed with status "error".
+    """
+    items = [(it.text, it.lang) for it in req.items]
+    if all(cached_audio(*item) for item in items):
+        body = await anyio.to_thread.run_sync(_tts_archive, items)
+    else:
+        body = await upstream_lane.run(_tts_archive, items)
+    return Response(
+        content=body,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="tts.zip"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+
+from .ml import rationale, recommend
+from .models import SuggestBatchRequest, SuggestBatchResponse, SuggestRequest, SuggestResponse
+
+router = APIRouter(prefix="/ml")
+
+@router.post("/suggest", response_model=SuggestResponse)
+def suggest(req: SuggestRequest):
+    return {**recommend([req])[0], "rationale": rationale(req.language)}
+
+@router.post("/suggest/batch", response_model=SuggestBatchResponse)
+def suggest_batch(req: SuggestBatchRequest):
+    # The whole caseload is scored as one matrix
+    ranked = recommend(req.learners)
+    return {
+        "results": [
+            {**r, "rationale": rationale(l.language)}
+            for l, r in zip(req.learners, ranked)
+        ]
+    }
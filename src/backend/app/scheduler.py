@@ -1,13 +1,31 @@
+from datetime import datetime
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from .config import settings
 from .datasets import refresh_all
+from .aac_pool import reload_if_changed
+from .clients import registry
+from .ml import get_model
+from .routes_aac import warm_aac_pool
+from .services_google_images import concept_map
+from .translation_memory import preload_memory
 
 scheduler = BackgroundScheduler()
 
+def _ensure_started():
+    if not scheduler.running:
+        scheduler.start()
+
 def start_scheduler():
-    # Run once at startup
-    refresh_all()
+    # Snapshots are already loaded (lifespan); fresh data off the startup path
+    scheduler.add_job(
+        refresh_all,
+        next_run_time=datetime.now(),
+        id="load_datasets_job",
+        replace_existing=True,
+        max_instances=1,
+    )
 
     # Then refresh periodically
     scheduler.add_job(
@@ -18,4 +36,57 @@ def start_scheduler():
         max_instances=1,
         coalesce=True,
     )
-    scheduler.start()
+    _ensure_started()
+
+def _watch_aac_pool():
+    # Swap in a recompiled pool index if the file changed; re-warm if so
+    if reload_if_changed() and settings.AAC_WARMUP_ENABLED:
+        warm_aac_pool()
+
+def start_aac_pool_watch():
+    scheduler.add_job(
+        _watch_aac_pool,
+        trigger=IntervalTrigger(seconds=settings.AAC_POOL_WATCH_S),
+        id="aac_pool_watch_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    _ensure_started()
+
+def start_aac_warmup():
+    """
+    Warm the AAC caches in the background right after startup; the pool
+    watch job re-runs it whenever aac_pool.json changes.
+    """
+    scheduler.add_job(
+        warm_aac_pool,
+        next_run_time=datetime.now(),
+        id="aac_warmup_job",
+        replace_existing=True,
+        max_instances=1,
+    )
+    _ensure_started()
+
+def _preload():
+    # Heavy imports and one-off builds the first request would otherwise pay for
+    for step in (registry.preload, preload_memory, concept_map, get_model):
+        try:
+            step()
+        except Exception:
+            pass  # the request path retries lazily
+
+def start_preload():
+    """Load the deferred SDKs / data in the background once the app is up."""
+    scheduler.add_job(
+        _preload,
+        next_run_time=datetime.now(),
+        id="preload_job",
+        replace_existing=True,
+        max_instances=1,
+    )
+    _ensure_started()
+
+def stop_scheduler():
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
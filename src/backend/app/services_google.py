@@ -1,21 +1,58 @@
-from google.cloud import translate_v2 as translate
-from google.cloud import texttospeech
+from .admission import admit
+from .clients import registry
+from .metrics import observe_upstream
 
-def translate_text(text: str, target_lang: str, source_lang: str = "en") -> str:
+# Translate v2 accepts at most 128 segments per request and recommends
+# keeping the payload under ~5k characters.
+TRANSLATE_BATCH_MAX_ITEMS = 128
+TRANSLATE_BATCH_MAX_CHARS = 5000
+
+def _chunk_texts(texts: list[str]) -> list[list[str]]:
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    chars = 0
+    for t in texts:
+        if current and (
+            len(current) >= TRANSLATE_BATCH_MAX_ITEMS
+            or chars + len(t) > TRANSLATE_BATCH_MAX_CHARS
+        ):
+            chunks.append(current)
+            current, chars = [], 0
+        current.append(t)
+        chars += len(t)
+    if current:
+        chunks.append(current)
+    return chunks
+
+def translate_texts(texts: list[str], target_lang: str, source_lang: str = "en") -> list[str]:
     """
-    Uses Google Cloud Translate.
-    target_lang: "hi", "ta", "en" etc.
+    Uses Google Cloud Translate (target_lang: "hi", "ta", "en" etc.).
+    Sends the list in as few Translate calls as the API limits allow and
+    returns the translations in input order.
     """
-    client = translate.Client()
-    res = client.translate(text, target_language=target_lang, source_language=source_lang)
-    return res["translatedText"]
+    if not texts:
+        return []
+
+    client = registry.translate()
+    out: list[str] = []
+    for chunk in _chunk_texts(texts):
+        with admit("translate"), observe_upstream("translate"):
+            res = client.translate(chunk, target_language=target_lang, source_language=source_lang)
+        out.extend(r["translatedText"] for r in res)
+    return out
+
+# Everything below that changes the audio output; part of the audio cache
+# key, so bump/extend it whenever the synthesis settings change.
+TTS_AUDIO_CONFIG = {"encoding": "MP3", "gender": "NEUTRAL"}
 
 def synthesize_speech_mp3(text: str, lang: str) -> bytes:
     """
     Uses Google Cloud Text-to-Speech and returns MP3 bytes.
     lang examples: "hi-IN", "ta-IN", "en-IN"
     """
-    client = texttospeech.TextToSpeechClient()
+    from google.cloud import texttospeech
+
+    client = registry.tts()
 
     synthesis_input = texttospeech.SynthesisInput(text=text)
 
@@ -28,10 +65,11 @@ def synthesize_speech_mp3(text: str, lang: str) -> bytes:
         audio_encoding=texttospeech.AudioEncoding.MP3
     )
 
-    response = client.synthesize_speech(
-        input=synthesis_input,
-        voice=voice,
-        audio_config=audio_config,
-    )
+    with admit("tts"), observe_upstream("tts"):
+        response = client.synthesize_speech(
+            input=synthesis_input,
+            voice=voice,
+            audio_config=audio_config,
+        )
 
     return response.audio_content
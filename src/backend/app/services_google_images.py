@@ -1,14 +1,54 @@
 import os
 import json
-import requests
+import threading
+import time
 import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 
+import httpx
+
+from .admission import Overloaded, admit
+from . import arasaac_index
+from .circuit import CircuitBreaker
+from .clients import registry
+from .config import settings
+from .metrics import observe_upstream, register_collector
+
 PLACEHOLDER = "https://via.placeholder.com/256?text=AAC"
 
 ARASAAC_SEARCH = "https://api.arasaac.org/api/pictograms/en/search/{}"
 ARASAAC_PNG = "https://static.arasaac.org/pictograms/{}/{}_500.png"
 
+# Live ARASAAC searches: shared worker pool + breaker so an outage fails
+# fast for the whole board instead of timing out tile by tile
+_search_pool = ThreadPoolExecutor(
+    max_workers=settings.ARASAAC_SEARCH_WORKERS, thread_name_prefix="arasaac"
+)
+_arasaac_breaker = CircuitBreaker(
+    "arasaac",
+    failure_threshold=settings.ARASAAC_BREAKER_FAILURES,
+    reset_after_s=settings.ARASAAC_BREAKER_RESET_S,
+)
+
+def breaker_stats() -> dict:
+    return {"arasaac": _arasaac_breaker.stats()}
+
+_BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+def _metric_samples():
+    st = _arasaac_breaker.stats()
+    return [
+        ("circuit_breaker_state", "gauge", "0 closed, 1 half-open, 2 open.",
+         [({"upstream": "arasaac"}, _BREAKER_STATES[st["state"]])]),
+        ("circuit_breaker_rejected_total", "counter", "Calls refused while open.",
+         [({"upstream": "arasaac"}, st["rejected"])]),
+        ("threadpool_waiting", "gauge", "Tasks queued for a worker thread.",
+         [({"pool": "arasaac_search"}, _search_pool._work_queue.qsize())]),
+    ]
+
+register_collector("arasaac", _metric_samples)
+
 # Optional mapping file (create later if you want)
 MAP_PATH = Path(__file__).parent / "aac_image_map.json"
 
@@ -20,7 +60,17 @@ def _load_map() -> dict:
             return {}
     return {}
 
-_CONCEPT_MAP = _load_map()
+# Read on first image lookup, not at import
+_map_lock = threading.Lock()
+_concept_map: dict | None = None
+
+def concept_map() -> dict:
+    global _concept_map
+    if _concept_map is None:
+        with _map_lock:
+            if _concept_map is None:
+                _concept_map = _load_map()
+    return _concept_map
 
 def _normalize(s: str) -> str:
     return (s or "").strip().lower()
@@ -61,26 +111,149 @@ def _score_item(item, wanted_terms: list[str]) -> int:
                     score += 20
     return score
 
-def _best_arasaac_png(terms: list[str]) -> str | None:
+def _counts_as_failure(exc: Exception) -> bool:
+    """Only timeouts, transport errors and 5xx say ARASAAC is unhealthy."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+def fetch_arasaac(url: str, timeout: float, label: str = "arasaac") -> httpx.Response:
     """
-    Search ARASAAC with multiple terms and pick best scored result.
-    Prevents always taking "first" which is often generic.
+    One ARASAAC request outside the search path (e.g. pictogram sources).
+    - Refused with Overloaded while the breaker is open, and beyond the
+      "arasaac" admission limit
+    - Timeouts, transport errors and 5xx count as breaker failures;
+      raises httpx errors like raise_for_status()
     """
-    all_results = []
+    if not _arasaac_breaker.allow():
+        raise Overloaded("arasaac", settings.ARASAAC_BREAKER_RESET_S)
+    try:
+        with admit("arasaac"):
+            try:
+                with observe_upstream(label):
+                    r = registry.http().get(url, timeout=timeout)
+                    r.raise_for_status()
+            except Exception as exc:
+                if _counts_as_failure(exc):
+                    _arasaac_breaker.record_failure()
+                raise
+        _arasaac_breaker.record_success()
+        return r
+    finally:
+        _arasaac_breaker.release()  # no outcome (shed, 404): free a half-open trial
+
+def _search_once(url: str, deadline: float, strike: threading.Lock) -> list:
+    """
+    One search request. `strike` is shared by the copies of a hedged term,
+    so a term that fails twice still counts as one breaker failure.
+    """
+    timeout = deadline - time.monotonic()
+    if timeout <= 0:
+        raise TimeoutError("image budget exhausted")
+    # Overloaded is raised before the call: it says nothing about ARASAAC health
+    with admit("arasaac"):
+        try:
+            with observe_upstream("arasaac"):
+                r = registry.http().get(url, timeout=timeout)
+                if r.status_code == 404:
+                    # ARASAAC's answer for a term without pictograms
+                    results = []
+                else:
+                    r.raise_for_status()
+                    results = r.json() or []
+        except Exception as exc:
+            if _counts_as_failure(exc) and strike.acquire(blocking=False):
+                _arasaac_breaker.record_failure()
+            raise
+    _arasaac_breaker.record_success()
+    return results if isinstance(results, list) else []
 
+def _search_terms_parallel(terms: list[str], deadline: float) -> list:
+    """
+    Search all terms at once within the deadline.
+    - A term still running after ARASAAC_HEDGE_AFTER_S gets one duplicate
+      (hedged) request; whichever answers first wins
+    - Terms unanswered at the deadline are dropped
+    Results keep term order, 25 per term.
+    """
+    urls = {}
+    strikes: dict[str, threading.Lock] = {}
     for term in terms:
         q = urllib.parse.quote(_normalize(term))
-        if not q:
-            continue
-        try:
-            r = requests.get(ARASAAC_SEARCH.format(q), timeout=8)
-            r.raise_for_status()
-            results = r.json() or []
-            if isinstance(results, list):
-                all_results.extend(results[:25])  # limit results
-        except Exception:
-            continue
+        if q:
+            urls[term] = ARASAAC_SEARCH.format(q)
+            strikes[term] = threading.Lock()
+
+    owner: dict[Future, str] = {
+        _search_pool.submit(_search_once, url, deadline, strikes[term]): term
+        for term, url in urls.items()
+    }
+    results: dict[str, list] = {}
+    failed: dict[str, int] = {}
+    overloaded: Overloaded | None = None
+    hedge_at = time.monotonic() + settings.ARASAAC_HEDGE_AFTER_S
+    hedged = False
+
+    while owner:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        wait_until = deadline if hedged else min(deadline, hedge_at)
+        done, _ = wait(list(owner), timeout=wait_until - now, return_when=FIRST_COMPLETED)
+
+        for fut in done:
+            term = owner.pop(fut)
+            if term in results:
+                continue
+            if fut.exception() is None:
+                results[term] = fut.result()[:25]  # limit results
+                # the other copy of a hedged term is no longer needed
+                for other in [f for f, t in owner.items() if t == term]:
+                    other.cancel()
+                    owner.pop(other)
+            else:
+                failed[term] = failed.get(term, 0) + 1
+                if isinstance(fut.exception(), Overloaded):
+                    overloaded = fut.exception()
+
+        if not hedged and time.monotonic() >= hedge_at:
+            hedged = True
+            in_flight = set(owner.values())
+            for term in in_flight:
+                owner[_search_pool.submit(_search_once, urls[term], deadline, strikes[term])] = term
+
+    if not results and overloaded is not None:
+        # Shed, not failed: let the caller retry later instead of caching a fallback
+        raise overloaded
+
+    all_results = []
+    for term in urls:
+        all_results.extend(results.get(term, []))
+    return all_results
 
+def _best_arasaac_png(terms: list[str], deadline: float) -> str | None:
+    """
+    Search ARASAAC with multiple terms and pick best scored result.
+    Prevents always taking "first" which is often generic.
+    Uses the offline index when available; the live API only on a miss,
+    and not at all while the ARASAAC circuit breaker is open.
+    """
+    index = arasaac_index.get_index()
+    if index is not None:
+        pic_id = index.best_pictogram_id(terms)
+        if pic_id:
+            return ARASAAC_PNG.format(pic_id, pic_id)
+
+    if not _arasaac_breaker.allow():
+        return None
+
+    try:
+        all_results = _search_terms_parallel(terms, deadline)
+    finally:
+        # A half-open trial that never reached ARASAAC (shed, budget already
+        # spent, nothing to search) recorded no outcome: hand it back so the
+        # breaker doesn't stay half-open forever. No-op once one is recorded.
+        _arasaac_breaker.release()
     if not all_results:
         return None
 
@@ -92,7 +265,7 @@ def _best_arasaac_png(terms: list[str]) -> str | None:
 
     return ARASAAC_PNG.format(pic_id, pic_id)
 
-def _google_image_url(query: str) -> str | None:
+def _google_image_url(query: str, deadline: float) -> str | None:
     """
     Optional Google Custom Search fallback (if keys are configured)
     """
@@ -101,25 +274,32 @@ def _google_image_url(query: str) -> str | None:
     if not api_key or not cx:
         return None
 
+    timeout = min(10.0, deadline - time.monotonic())
+    if timeout <= 0:
+        return None
+
     try:
-        resp = requests.get(
-            "https://www.googleapis.com/customsearch/v1",
-            params={
-                "key": api_key,
-                "cx": cx,
-                "q": query + " pictogram icon",
-                "searchType": "image",
-                "num": 1,
-                "safe": "active",
-            },
-            timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+        with admit("customsearch"), observe_upstream("customsearch"):
+            resp = registry.http().get(
+                "https://www.googleapis.com/customsearch/v1",
+                params={
+                    "key": api_key,
+                    "cx": cx,
+                    "q": query + " pictogram icon",
+                    "searchType": "image",
+                    "num": 1,
+                    "safe": "active",
+                },
+                timeout=timeout,
+            )
+            resp.raise_for_status()
+            data = resp.json()
         items = data.get("items", [])
         if not items:
             return None
         return items[0].get("link")
+    except Overloaded:
+        raise
     except Exception:
         return None
 
@@ -130,20 +310,22 @@ def fetch_image_url(concept: str) -> str:
     2) concept itself -> best ARASAAC match
     3) google fallback (optional)
     4) placeholder
+    All steps share one IMAGE_RESOLVE_BUDGET_S time budget.
     """
     c = _normalize(concept)
+    deadline = time.monotonic() + settings.IMAGE_RESOLVE_BUDGET_S
 
-    mapped = _CONCEPT_MAP.get(c, [])
+    mapped = concept_map().get(c, [])
     if mapped:
-        img = _best_arasaac_png(mapped)
+        img = _best_arasaac_png(mapped, deadline)
         if img:
             return img
 
-    img = _best_arasaac_png([concept])
+    img = _best_arasaac_png([concept], deadline)
     if img:
         return img
 
-    g = _google_image_url(concept)
+    g = _google_image_url(concept, deadline)
     if g:
         return g
 
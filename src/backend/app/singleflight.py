@@ -0,0 +1,103 @@
+"""
+Single-flight request coalescing.
+
+Concurrent cache misses for the same key wait on one in-flight upstream
+call and all receive its result (or its exception). Keys are tuples whose
+first item is the kind ("tr", "img", "tts") so savings are counted per kind.
+"""
+import threading
+from typing import Any, Callable, Hashable
+
+from .metrics import register_collector
+
+
+class _Call:
+    __slots__ = ("event", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.leaders: dict[str, int] = {}
+        self.saved: dict[str, int] = {}
+
+    @staticmethod
+    def _kind(key: Hashable) -> str:
+        return str(key[0]) if isinstance(key, tuple) and key else "other"
+
+    def claim(self, key: Hashable) -> tuple[_Call, bool]:
+        """
+        Join the in-flight call for key, or start one.
+        Returns (call, is_leader); the leader must call resolve().
+        """
+        kind = self._kind(key)
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.saved[kind] = self.saved.get(kind, 0) + 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            self.leaders[kind] = self.leaders.get(kind, 0) + 1
+            return call, True
+
+    def resolve(self, key: Hashable, call: _Call, value: Any = None,
+                error: BaseException | None = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.value = value
+        call.error = error
+        call.event.set()
+
+    @staticmethod
+    def wait(call: _Call) -> Any:
+        call.event.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        call, leader = self.claim(key)
+        if not leader:
+            return self.wait(call)
+        try:
+            value = fn(*args)
+        except BaseException as e:
+            self.resolve(key, call, error=e)
+            raise
+        self.resolve(key, call, value=value)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "lookups": dict(self.leaders),
+                "upstream_calls_saved": dict(self.saved),
+            }
+
+
+# Shared by translation, image and TTS lookups
+flight = SingleFlight()
+
+
+def _metric_samples():
+    st = flight.stats()
+    return [
+        ("singleflight_in_flight", "gauge", "Upstream lookups currently shared.",
+         [({}, st["in_flight"])]),
+        ("singleflight_calls_saved_total", "counter", "Upstream calls avoided by joining a lookup.",
+         [({"kind": k}, v) for k, v in st["upstream_calls_saved"].items()]),
+    ]
+
+
+register_collector("singleflight", _metric_samples)
@@ -0,0 +1,49 @@
+"""
+Cold-start timeline of this process, exposed on /metrics.
+
+- Each phase is recorded once, in seconds since the process started
+  (from /proc on Linux, else since this module was imported):
+  app_imported, startup_complete, health (first "/" answered) and
+  ready (first 200 from /ready)
+- app_startup_seconds{phase} lets dashboards track cold start as a number;
+  python -m bench.startup adds a per-module import profile
+"""
+import os
+import time
+
+from .metrics import register_collector
+
+
+def _process_age() -> float:
+    """Seconds since this process was started (0 if unknown)."""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            # Field 22 (starttime, in clock ticks since boot); fields after
+            # the ")" of the command name start at field 3
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+_T0 = time.perf_counter() - _process_age()
+
+PHASES: dict[str, float] = {}
+
+
+def mark(phase: str) -> None:
+    """Record the first time a phase is reached; later calls are no-ops."""
+    if phase not in PHASES:
+        PHASES[phase] = time.perf_counter() - _T0
+
+
+def _metric_samples():
+    return [
+        ("app_startup_seconds", "gauge", "Seconds from process start to each startup phase.",
+         [({"phase": phase}, round(s, 4)) for phase, s in PHASES.items()]),
+    ]
+
+
+register_collector("startup", _metric_samples)
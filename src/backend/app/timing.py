@@ -0,0 +1,59 @@
+"""
+Per-request phase timings, sent as a Server-Timing header.
+
+A route calls start_timing(); code below it (including worker threads,
+which inherit the context) records phases with span() / mark(). Phases
+that run concurrently (e.g. many image lookups) are reported as their
+wall-clock extent, from the first start to the last end.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current: ContextVar["ServerTiming | None"] = ContextVar("server_timing", default=None)
+
+
+class ServerTiming:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: dict[str, list[float]] = {}  # name -> [first start, last end]
+
+    def mark(self, name: str, start: float, end: float) -> None:
+        with self._lock:
+            span = self._spans.get(name)
+            if span is None:
+                self._spans[name] = [start, end]
+            else:
+                span[0] = min(span[0], start)
+                span[1] = max(span[1], end)
+
+    @contextmanager
+    def span(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, t0, time.perf_counter())
+
+    def header(self) -> str:
+        with self._lock:
+            spans = list(self._spans.items())
+        return ", ".join(f"{name};dur={(end - start) * 1000:.1f}" for name, (start, end) in spans)
+
+
+def start_timing() -> ServerTiming:
+    timing = ServerTiming()
+    _current.set(timing)
+    return timing
+
+
+@contextmanager
+def span(name: str):
+    """Record a phase on the current request, if it is being timed."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    with timing.span(name):
+        yield
@@ -0,0 +1,264 @@
+"""
+Local translation memory (TM), consulted before Google Translate.
+
+- Human tier: seeded at startup from tm_glossary.json (curated board
+  labels and activity strings) and the frontend locale bundles
+  (src/i18n/locales/<lang>/common.json, paired by key path)
+- MT tier: accepted Google results, written back and persisted in the
+  disk cache so they survive restarts; only pairs of TM_LANGS get one, so
+  client-supplied languages can't grow it without bound
+- Lookups: exact text first, then normalized (NFKC, case-insensitive,
+  whitespace collapsed); human entries always win over MT ones
+- Seeding and loading a pair's MT tier read files / SQLite: they happen in
+  the background preload, and async callers go through memory_for(), which
+  does any remaining load in a worker thread. After that, lookups are plain
+  dict reads, safe to do on the event loop
+"""
+import json
+import threading
+import unicodedata
+from itertools import permutations
+from pathlib import Path
+from typing import Iterable, Optional
+
+import anyio
+
+from .cache_store import CacheStore
+from .config import settings
+from .metrics import register_collector
+from .services_google import translate_texts
+
+GLOSSARY_PATH = Path(__file__).parent / "tm_glossary.json"
+
+_store = CacheStore(settings.data_path / settings.AAC_CACHE_DB)
+
+
+def normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def _mt_ns(source: str, target: str) -> str:
+    return f"tm:mt:{source}:{target}"
+
+
+class _Segments:
+    """Exact and normalized text -> translation for one language pair and tier."""
+
+    __slots__ = ("exact", "norm")
+
+    def __init__(self) -> None:
+        self.exact: dict[str, str] = {}
+        self.norm: dict[str, str] = {}
+
+    def add(self, text: str, translation: str, overwrite: bool) -> None:
+        if overwrite:
+            self.exact[text] = translation
+            self.norm[normalize(text)] = translation
+        else:
+            self.exact.setdefault(text, translation)
+            self.norm.setdefault(normalize(text), translation)
+
+    def get(self, text: str) -> Optional[str]:
+        hit = self.exact.get(text)
+        return hit if hit is not None else self.norm.get(normalize(text))
+
+
+class TranslationMemory:
+    def __init__(self, store: CacheStore) -> None:
+        self.store = store
+        self._lock = threading.Lock()
+        self._human: dict[tuple[str, str], _Segments] = {}
+        self._mt: dict[tuple[str, str], _Segments] = {}
+        self.hits = {"human": 0, "mt": 0}
+        self.misses = 0
+
+    def add_human(self, source: str, target: str, pairs: Iterable[tuple[str, str]]) -> None:
+        """Seed entries; the first translation seen for a text is kept."""
+        with self._lock:
+            segments = self._human.setdefault((source, target), _Segments())
+            for text, translation in pairs:
+                if text.strip() and translation.strip():
+                    segments.add(text, translation, overwrite=False)
+
+    @staticmethod
+    def _tracked(source: str, target: str) -> bool:
+        langs = settings.tm_langs_list
+        return source != target and source in langs and target in langs
+
+    def loaded(self, source: str, target: str) -> bool:
+        """True when a lookup for this pair won't touch the disk."""
+        return not self._tracked(source, target) or (source, target) in self._mt
+
+    def _mt_segments(self, source: str, target: str) -> _Segments:
+        # Persisted MT entries for a pair are loaded the first time it is used
+        segments = self._mt.get((source, target))
+        if segments is None:
+            with self._lock:
+                segments = self._mt.get((source, target))
+                if segments is None:
+                    segments = _Segments()
+                    for text, translation in self.store.items(_mt_ns(source, target)).items():
+                        segments.add(text, translation, overwrite=True)
+                    self._mt[(source, target)] = segments
+        return segments
+
+    def lookup(self, text: str, target: str, source: str = "en") -> Optional[str]:
+        if source == target:
+            return text
+        human = self._human.get((source, target))
+        hit = human.get(text) if human is not None else None
+        if hit is not None:
+            self.hits["human"] += 1
+            return hit
+        hit = self._mt_segments(source, target).get(text) if self._tracked(source, target) else None
+        if hit is not None:
+            self.hits["mt"] += 1
+            return hit
+        self.misses += 1
+        return None
+
+    def remember(self, source: str, target: str, pairs: dict[str, str]) -> None:
+        """Write accepted upstream translations back (memory + disk)."""
+        pairs = {
+            text: translation
+            for text, translation in pairs.items()
+            if 0 < len(text) <= settings.TM_MAX_TEXT_CHARS and translation.strip()
+        }
+        if not pairs or not self._tracked(source, target):
+            return
+        segments = self._mt_segments(source, target)
+        with self._lock:
+            room = settings.TM_MAX_MT_ENTRIES - len(segments.exact)
+            pairs = dict(list(pairs.items())[:max(0, room)])
+            for text, translation in pairs.items():
+                segments.add(text, translation, overwrite=True)
+        self.store.set_many(_mt_ns(source, target), pairs)
+
+    def load_stored(self, source: str, target: str, texts: Iterable[str]) -> dict[str, str]:
+        """
+        Persisted MT entries for texts (disk read): picks up what other
+        workers wrote since this pair was loaded. Returns {text: translation}.
+        """
+        if not self._tracked(source, target):
+            return {}
+        found = self.store.get_many(_mt_ns(source, target), list(dict.fromkeys(texts)))
+        if found:
+            segments = self._mt_segments(source, target)
+            with self._lock:
+                for text, translation in found.items():
+                    segments.add(text, translation, overwrite=True)
+        return found
+
+    def clear_mt(self) -> None:
+        """Forget the in-memory MT tier (the disk copy is left alone)."""
+        with self._lock:
+            self._mt.clear()
+
+    def stats(self) -> dict:
+        return {
+            "human_entries": sum(len(s.exact) for s in self._human.values()),
+            "mt_entries": sum(len(s.exact) for s in self._mt.values()),
+            "hits": dict(self.hits),
+            "misses": self.misses,
+        }
+
+
+def _flatten(bundle: dict, prefix: str = "") -> dict[str, str]:
+    out: dict[str, str] = {}
+    for key, value in bundle.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            out.update(_flatten(value, path))
+        elif isinstance(value, str):
+            out[path] = value
+    return out
+
+
+def _seed_glossary(memory: TranslationMemory, path: Path) -> None:
+    rows = json.loads(path.read_text(encoding="utf-8"))
+    langs = sorted({lang for row in rows for lang in row})
+    for source, target in permutations(langs, 2):
+        memory.add_human(
+            source,
+            target,
+            ((row[source], row[target]) for row in rows if source in row and target in row),
+        )
+
+
+def _seed_locales(memory: TranslationMemory, locales_dir: Path) -> None:
+    bundles: dict[str, dict[str, str]] = {}
+    for path in sorted(locales_dir.glob("*/common.json")):
+        try:
+            bundles[path.parent.name] = _flatten(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    for source, target in permutations(bundles, 2):
+        src, tgt = bundles[source], bundles[target]
+        memory.add_human(source, target, ((src[k], tgt[k]) for k in src if k in tgt))
+
+
+_lock = threading.Lock()
+_memory: Optional[TranslationMemory] = None
+
+
+def get_memory() -> TranslationMemory:
+    global _memory
+    if _memory is None:
+        with _lock:
+            if _memory is None:
+                memory = TranslationMemory(_store)
+                if settings.TM_SEED_ENABLED:
+                    # Curated glossary first: it wins over the UI strings
+                    _seed_glossary(memory, GLOSSARY_PATH)
+                    _seed_locales(memory, settings.tm_locales_path)
+                _memory = memory
+    return _memory
+
+
+def _load_pair(source: str, target: str) -> TranslationMemory:
+    memory = get_memory()
+    if not memory.loaded(source, target):
+        memory._mt_segments(source, target)
+    return memory
+
+
+async def memory_for(target: str, source: str = "en") -> TranslationMemory:
+    """The memory, ready for event-loop lookups of this pair."""
+    memory = _memory
+    if memory is None or not memory.loaded(source, target):
+        memory = await anyio.to_thread.run_sync(_load_pair, source, target)
+    return memory
+
+
+def preload_memory() -> None:
+    """Seed the memory and load the MT tier of every en -> TM_LANGS pair."""
+    for lang in settings.tm_langs_list:
+        _load_pair("en", lang)
+
+
+def translate_misses(texts: list[str], target: str, source: str = "en") -> dict[str, str]:
+    """
+    Translate texts that missed the memory: the distinct ones go to
+    Google in one batched call and are written back to the memory.
+    Returns {text: translation}.
+    """
+    missing = list(dict.fromkeys(texts))
+    translated = dict(zip(missing, translate_texts(missing, target, source)))
+    get_memory().remember(source, target, translated)
+    return translated
+
+
+def _metric_samples():
+    if _memory is None:
+        return []
+    stats = _memory.stats()
+    return [
+        ("translation_memory_entries", "gauge", "Translation memory segments per tier.",
+         [({"tier": "human"}, stats["human_entries"]), ({"tier": "mt"}, stats["mt_entries"])]),
+        ("translation_memory_lookups_total", "counter", "Translation memory lookups by result.",
+         [({"result": tier}, n) for tier, n in stats["hits"].items()]
+         + [({"result": "miss"}, stats["misses"])]),
+    ]
+
+
+register_collector("translation_memory", _metric_samples)
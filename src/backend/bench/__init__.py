@@ -0,0 +1,24 @@
+"""
+Load / latency benchmarks for the backend hot paths.
+
+Runs the real app in-process (ASGI transport, no sockets) against fake
+Google Translate / TTS / Custom Search and ARASAAC upstreams with
+configurable latency and error injection:
+
+    python -m bench.run                       # from src/backend
+    python -m bench.compare results/a.json results/b.json
+    python -m bench.startup                   # cold start + import profile
+"""
+import subprocess
+from pathlib import Path
+
+
+def git_commit() -> str:
+    """Short sha of HEAD ("-dirty" with local changes); names result files."""
+    here = Path(__file__).resolve().parent
+    try:
+        sha = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=here, text=True).strip()
+        dirty = subprocess.call(["git", "diff", "--quiet", "HEAD"], cwd=here) != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{sha}-dirty" if dirty else sha
@@ -0,0 +1,79 @@
+"""
+Compare two benchmark result files.
+
+    python -m bench.compare results/<base>.json results/<new>.json [--threshold 10]
+
+Prints per-row deltas for throughput and p50/p95/p99; exits 1 if any row
+regressed by more than --threshold percent (lower throughput or higher
+latency), so it can gate CI. Latency changes smaller than --min-delta-ms
+are ignored: warm paths are sub-millisecond and mostly noise.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+METRICS = (  # (field, higher_is_better)
+    ("throughput_rps", True),
+    ("p50_ms", False),
+    ("p95_ms", False),
+    ("p99_ms", False),
+)
+
+
+def _rows(path: Path) -> tuple[dict, dict]:
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    rows = {(r["scenario"], r["phase"], r["concurrency"]): r for r in doc["results"]}
+    return doc, rows
+
+
+def _delta_pct(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0
+    return (new - old) / old * 100
+
+
+def compare(base: Path, new: Path, threshold: float, min_delta_ms: float) -> int:
+    base_doc, base_rows = _rows(base)
+    new_doc, new_rows = _rows(new)
+    print(f"base {base_doc['commit']}  ->  new {new_doc['commit']}  (threshold {threshold:g}%)")
+    if base_doc.get("config") != new_doc.get("config"):
+        print("warning: configs differ; deltas may not be comparable")
+
+    header = f"{'scenario':<10} {'phase':<5} {'c':>4}" + "".join(f" {m:>22}" for m, _ in METRICS)
+    print(header)
+    regressions = 0
+    for key in sorted(base_rows.keys() & new_rows.keys()):
+        old, cur = base_rows[key], new_rows[key]
+        cells = []
+        for metric, higher_is_better in METRICS:
+            d = _delta_pct(old[metric], cur[metric])
+            worse = -d if higher_is_better else d
+            if not higher_is_better and cur[metric] - old[metric] < min_delta_ms:
+                worse = 0.0
+            flag = "!" if worse > threshold else " "
+            regressions += flag == "!"
+            cells.append(f" {old[metric]:>8.1f}->{cur[metric]:>8.1f} {d:+5.0f}%{flag}")
+        print(f"{key[0]:<10} {key[1]:<5} {key[2]:>4}" + "".join(cells))
+
+    for key in sorted(base_rows.keys() ^ new_rows.keys()):
+        print(f"only in {'base' if key in base_rows else 'new'}: {key}")
+
+    if regressions:
+        print(f"{regressions} metric(s) regressed by more than {threshold:g}%")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("base", type=Path)
+    ap.add_argument("new", type=Path)
+    ap.add_argument("--threshold", type=float, default=10.0, help="allowed regression in percent")
+    ap.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore smaller latency changes")
+    args = ap.parse_args(argv)
+    sys.exit(compare(args.base, args.new, args.threshold, args.min_delta_ms))
+
+
+if __name__ == "__main__":
+    main()
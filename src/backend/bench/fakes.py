@@ -0,0 +1,165 @@
+"""
+In-process stand-ins for the upstream APIs.
+
+- Translate / TTS: objects with the same methods the Google clients expose
+- ARASAAC search / Custom Search: an httpx.MockTransport behind the shared
+  pool, so the real request code (timeouts, hedging, breaker) runs unchanged
+Each upstream has its own latency (+ jitter) and error rate.
+"""
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.clients import registry
+
+UPSTREAMS = ("translate", "tts", "arasaac", "arasaac_static", "customsearch")
+
+
+@dataclass
+class UpstreamProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+
+@dataclass
+class FakeUpstreams:
+    profiles: dict[str, UpstreamProfile] = field(
+        default_factory=lambda: {name: UpstreamProfile() for name in UPSTREAMS}
+    )
+    seed: int = 0
+    calls: dict[str, int] = field(default_factory=lambda: {name: 0 for name in UPSTREAMS})
+    errors: dict[str, int] = field(default_factory=lambda: {name: 0 for name in UPSTREAMS})
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rnd = random.Random(self.seed)
+
+    def hit(self, upstream: str) -> bool:
+        """Sleep for the simulated latency; True if this call should fail."""
+        p = self.profiles[upstream]
+        with self._lock:
+            self.calls[upstream] += 1
+            delay = p.latency_ms + self._rnd.uniform(0, p.jitter_ms)
+            fail = self._rnd.random() < p.error_rate
+            if fail:
+                self.errors[upstream] += 1
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return fail
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            for name in UPSTREAMS:
+                self.calls[name] = 0
+                self.errors[name] = 0
+
+    def install(self) -> None:
+        """Swap the fakes into the shared client registry."""
+        registry.close()
+        registry._translate = FakeTranslateClient(self)
+        registry._tts = FakeTTSClient(self)
+        registry._http = httpx.Client(
+            transport=httpx.MockTransport(self._handle_http),
+            event_hooks={"request": [registry._on_request]},
+        )
+
+    # --- ARASAAC + Custom Search ---
+
+    def _handle_http(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host == "api.arasaac.org":
+            if self.hit("arasaac"):
+                return httpx.Response(503)
+            term = request.url.path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json=_arasaac_results(term))
+        if host == "static.arasaac.org":
+            if self.hit("arasaac_static"):
+                return httpx.Response(503)
+            return httpx.Response(200, content=_pictogram_png(), headers={"content-type": "image/png"})
+        if host == "www.googleapis.com":
+            if self.hit("customsearch"):
+                return httpx.Response(429)
+            q = request.url.params.get("q", "")
+            return httpx.Response(200, json={"items": [{"link": f"https://images.example/{_digest(q)}.png"}]})
+        return httpx.Response(404)
+
+
+class UpstreamError(Exception):
+    pass
+
+
+class FakeTranslateClient:
+    def __init__(self, fakes: FakeUpstreams) -> None:
+        self._fakes = fakes
+
+    def translate(self, values, target_language: str, source_language: str = "en"):
+        if self._fakes.hit("translate"):
+            raise UpstreamError("translate: injected failure")
+        if isinstance(values, str):
+            return {"translatedText": f"{values} [{target_language}]"}
+        return [{"translatedText": f"{v} [{target_language}]"} for v in values]
+
+
+class _FakeAudio:
+    def __init__(self, audio_content: bytes) -> None:
+        self.audio_content = audio_content
+
+
+class FakeTTSClient:
+    def __init__(self, fakes: FakeUpstreams) -> None:
+        self._fakes = fakes
+
+    def synthesize_speech(self, input, voice, audio_config):
+        if self._fakes.hit("tts"):
+            raise UpstreamError("tts: injected failure")
+        # ~16 KB: about one second of 128 kbps MP3
+        seed = f"{voice.language_code}:{input.text}".encode("utf-8")
+        return _FakeAudio(hashlib.sha256(seed).digest() * 512)
+
+
+_png: bytes | None = None
+
+
+def _pictogram_png() -> bytes:
+    """A 500x500 flat-colour PNG, like an ARASAAC pictogram."""
+    global _png
+    if _png is None:
+        import io
+
+        from PIL import Image, ImageDraw
+
+        im = Image.new("RGBA", (500, 500), (255, 255, 255, 0))
+        draw = ImageDraw.Draw(im)
+        draw.ellipse((60, 60, 440, 440), fill=(250, 200, 40, 255), outline=(0, 0, 0, 255), width=12)
+        draw.rectangle((170, 300, 330, 330), fill=(0, 0, 0, 255))
+        buf = io.BytesIO()
+        im.save(buf, "PNG")
+        _png = buf.getvalue()
+    return _png
+
+
+def _digest(s: str) -> str:
+    return hashlib.sha256(s.encode("utf-8")).hexdigest()[:16]
+
+
+def _arasaac_results(term: str) -> list[dict]:
+    base = int(_digest(term), 16) % 90000 + 1000
+    return [
+        {"_id": base + i, "keywords": [{"keyword": term if i == 0 else f"{term} {i}"}]}
+        for i in range(5)
+    ]
+
+
+def parse_profiles(spec: str, fakes: FakeUpstreams, attr: str) -> None:
+    """Apply "translate=80,tts=150" style overrides to one profile field."""
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, value = part.partition("=")
+        if name not in fakes.profiles:
+            raise SystemExit(f"unknown upstream {name!r}; choose from {', '.join(UPSTREAMS)}")
+        setattr(fakes.profiles[name], attr, float(value))
+
@@ -0,0 +1,215 @@
+"""
+Benchmark runner.
+
+For every scenario and concurrency level:
+- cold: caches (memory, SQLite, TTS files, the translation memory's MT
+  tier) are wiped, then N requests
+- warm: the same N requests again
+The translation memory's glossary / locale seeding is off unless --tm-seed
+is given: seeded, it covers every bench word and concept, so cold phases
+would never reach the (fake) translator.
+Reports throughput and p50/p95/p99 latency and writes a JSON result file
+named after the current commit (bench/results/<sha>.json).
+
+    python -m bench.run --concurrency 1,8,32 --requests 200 \\
+        --latency translate=80,tts=150,arasaac=120 --errors arasaac=0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCH_DIR / "results"
+
+# Isolated state dir + no background jobs; must be set before importing app
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="aac-bench-")
+os.environ["DATA_REFRESH_ENABLED"] = "false"
+os.environ["AAC_WARMUP_ENABLED"] = "false"
+os.environ.setdefault("GOOGLE_SEARCH_API_KEY", "bench")
+os.environ.setdefault("GOOGLE_SEARCH_CX", "bench")
+
+import httpx  # noqa: E402
+
+from app import audio_cache, routes_aac  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+from bench import git_commit  # noqa: E402
+from app.translation_memory import get_memory  # noqa: E402
+from bench.fakes import FakeUpstreams, parse_profiles  # noqa: E402
+
+DEFAULT_LATENCY = "translate=60,tts=120,arasaac=90,customsearch=150"
+DEFAULT_JITTER = "translate=20,tts=40,arasaac=60,customsearch=50"
+
+LANGS = ("hi", "ta", "en")
+WORDS = ("water", "eat", "happy", "school", "help", "play", "dosa", "mother", "sleep", "bus")
+
+
+# --- scenarios: (method, path, params/json) per request index ---
+
+def _board(i: int):
+    return "GET", "/aac/board", {"params": {"lang": LANGS[i % 3], "size": 24, "seed": f"bench-{i % 8}"}}
+
+def _symbols(i: int):
+    cats = ("core", "feelings", "actions", "indian_food")[i % 4]
+    return "GET", "/aac/symbols", {"params": {"lang": LANGS[i % 3], "limit": 40, "cats": cats}}
+
+def _translate(i: int):
+    body = {"text": WORDS[i % len(WORDS)], "targetLang": LANGS[i % 2], "sourceLang": "en"}
+    return "POST", "/i18n/translate", {"json": body}
+
+def _tts(i: int):
+    return "GET", "/i18n/tts", {"params": {"text": WORDS[i % len(WORDS)], "lang": LANGS[i % 3]}}
+
+SCENARIOS = {
+    "board": _board,
+    "symbols": _symbols,
+    "translate": _translate,
+    "tts": _tts,
+}
+
+
+def reset_caches() -> None:
+    routes_aac._translation_cache.clear()
+    routes_aac._image_cache.clear()
+    routes_aac._board_cache.clear()
+    routes_aac._store.clear()
+    get_memory().clear_mt()
+    shutil.rmtree(audio_cache.AUDIO_DIR, ignore_errors=True)
+
+
+def percentile(sorted_ms: list[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_ms:
+        return 0.0
+    rank = max(1, min(len(sorted_ms), round(q / 100 * len(sorted_ms) + 0.5)))
+    return sorted_ms[rank - 1]
+
+
+async def run_load(client: httpx.AsyncClient, scenario, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    next_i = 0
+
+    async def worker():
+        nonlocal next_i
+        while next_i < requests:
+            i = next_i
+            next_i += 1
+            method, path, kwargs = scenario(i)
+            t0 = time.perf_counter()
+            try:
+                r = await client.request(method, path, **kwargs)
+                await r.aread()
+                code = str(r.status_code)
+            except Exception as e:
+                code = type(e).__name__
+            latencies.append((time.perf_counter() - t0) * 1000)
+            statuses[code] = statuses.get(code, 0) + 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    ok = sum(n for code, n in statuses.items() if code.startswith(("2", "3")))
+    return {
+        "requests": requests,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "error_rate": round(1 - ok / requests, 4) if requests else 0.0,
+        "statuses": statuses,
+    }
+
+
+async def run_all(args, fakes: FakeUpstreams) -> list[dict]:
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        fakes.install()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for name in args.scenarios:
+                for c in args.concurrency:
+                    reset_caches()
+                    for phase in ("cold", "warm"):
+                        fakes.reset_counters()
+                        row = await run_load(client, SCENARIOS[name], args.requests, c)
+                        row.update(scenario=name, phase=phase, concurrency=c,
+                                   upstream_calls=dict(fakes.calls), upstream_errors=dict(fakes.errors))
+                        results.append(row)
+                        print(
+                            f"{name:<10} {phase:<4} c={c:<4} {row['throughput_rps']:>9.1f} rps"
+                            f"  p50={row['p50_ms']:>8.1f}  p95={row['p95_ms']:>8.1f}"
+                            f"  p99={row['p99_ms']:>8.1f} ms  err={row['error_rate']:.2%}",
+                            flush=True,
+                        )
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated: " + ",".join(SCENARIOS))
+    ap.add_argument("--concurrency", default="1,8,32", help="comma-separated levels")
+    ap.add_argument("--requests", type=int, default=120, help="requests per phase")
+    ap.add_argument("--latency", default=DEFAULT_LATENCY, help="per-upstream latency ms, e.g. tts=150")
+    ap.add_argument("--jitter", default=DEFAULT_JITTER, help="per-upstream extra random latency ms")
+    ap.add_argument("--errors", default="", help="per-upstream error rate 0..1, e.g. arasaac=0.05")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--tm-seed", action="store_true",
+                    help="seed the translation memory from the glossary / locale bundles")
+    ap.add_argument("--out", type=Path, default=None, help="result file (default results/<commit>.json)")
+    args = ap.parse_args(argv)
+
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in args.scenarios if s not in SCENARIOS]
+    if unknown:
+        ap.error(f"unknown scenario(s): {', '.join(unknown)}")
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    # Before the app's first get_memory() (startup preload)
+    settings.TM_SEED_ENABLED = args.tm_seed
+
+    fakes = FakeUpstreams(seed=args.seed)
+    parse_profiles(args.latency, fakes, "latency_ms")
+    parse_profiles(args.jitter, fakes, "jitter_ms")
+    parse_profiles(args.errors, fakes, "error_rate")
+
+    try:
+        results = asyncio.run(run_all(args, fakes))
+    finally:
+        shutil.rmtree(os.environ["DATA_DIR"], ignore_errors=True)
+
+    commit = git_commit()
+    out = args.out or RESULTS_DIR / f"{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "commit": commit,
+        "created_utc": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "tm_seed": args.tm_seed,
+            "upstreams": {k: vars(v) for k, v in fakes.profiles.items()},
+        },
+        "results": results,
+    }
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
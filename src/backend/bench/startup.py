@@ -0,0 +1,204 @@
+"""
+Cold-start profile: per-module import time and time to first ready request.
+
+Starts the real server (uvicorn) in a fresh process with
+PYTHONPROFILEIMPORTTIME=1, polls / and /ready until they answer, then
+reads the app's own startup phases (app_startup_seconds on /metrics).
+Reports, per run:
+- spawn -> first 200 from / and from /ready (wall clock, seen by a client)
+- app phases: app_imported, startup_complete, health, ready
+- imports done before startup completed: the heaviest modules and
+  top-level packages, and what was imported later (background preload /
+  first use); lines are split by when they were printed
+Writes results/startup-<commit>.json.
+
+    python -m bench.startup --runs 3 --top 15
+    python -m bench.startup --env DATA_REFRESH_ENABLED=true
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from bench import git_commit
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# No network at startup: no dataset refresh, no AAC warm-up
+DEFAULT_ENV = {
+    "DATA_REFRESH_ENABLED": "false",
+    "AAC_WARMUP_ENABLED": "false",
+}
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+_PHASE_LINE = re.compile(r'^app_startup_seconds\{phase="([^"]+)"\} (\S+)$')
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ok(client: httpx.Client, url: str, deadline: float) -> float | None:
+    while time.monotonic() < deadline:
+        try:
+            if client.get(url).status_code == 200:
+                return time.monotonic()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    return None
+
+
+def parse_importtime(lines: list[tuple[float, str]], cutoff: float) -> tuple[list[dict], list[dict]]:
+    """
+    -X importtime output as (arrival time, line), split at cutoff into
+    (startup, deferred). Rows: {"module", "self_ms", "cumulative_ms", "depth"}.
+    """
+    startup: list[dict] = []
+    deferred: list[dict] = []
+    for t, line in lines:
+        m = _IMPORT_LINE.match(line.rstrip("\n"))
+        if not m:
+            continue
+        (startup if t <= cutoff else deferred).append({
+            "module": m.group(4),
+            "self_ms": int(m.group(1)) / 1000,
+            "cumulative_ms": int(m.group(2)) / 1000,
+            "depth": len(m.group(3)) // 2,
+        })
+    return startup, deferred
+
+
+def _by_package(rows: list[dict]) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    for r in rows:
+        pkg = r["module"].split(".")[0]
+        totals[pkg] = totals.get(pkg, 0.0) + r["self_ms"]
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+
+def run_once(env_overrides: dict[str, str], timeout_s: float, top: int) -> dict:
+    data_dir = tempfile.mkdtemp(prefix="aac-startup-")
+    env = {**os.environ, **DEFAULT_ENV, **env_overrides, "DATA_DIR": data_dir, "PYTHONPROFILEIMPORTTIME": "1"}
+    port = _free_port()
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+
+    stderr: list[tuple[float, str]] = []
+
+    def read_stderr():
+        for line in proc.stderr:
+            stderr.append((time.monotonic(), line))
+
+    t0 = time.monotonic()
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stderr=subprocess.PIPE, text=True)
+    reader = threading.Thread(target=read_stderr, daemon=True)
+    reader.start()
+    try:
+        base = f"http://127.0.0.1:{port}"
+        with httpx.Client(timeout=1.0) as client:
+            deadline = t0 + timeout_s
+            t_health = _wait_ok(client, f"{base}/", deadline)
+            t_ready = _wait_ok(client, f"{base}/ready", deadline) if t_health else None
+            time.sleep(0.5)  # let the background preload finish its imports
+            phases = {}
+            if t_health:
+                for line in client.get(f"{base}/metrics").text.splitlines():
+                    m = _PHASE_LINE.match(line)
+                    if m:
+                        phases[m.group(1)] = float(m.group(2))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        reader.join(timeout=5)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    # The process starts at ~t0, so its own phase times map onto this clock
+    cutoff = t0 + phases.get("startup_complete", float("inf"))
+    startup, deferred = parse_importtime(stderr, cutoff)
+    return {
+        "spawn_to_health_s": round(t_health - t0, 4) if t_health else None,
+        "spawn_to_ready_s": round(t_ready - t0, 4) if t_ready else None,
+        "phases_s": phases,
+        "import_startup_ms": round(sum(r["self_ms"] for r in startup), 1),
+        "import_deferred_ms": round(sum(r["self_ms"] for r in deferred), 1),
+        "top_modules": sorted(startup, key=lambda r: -r["cumulative_ms"])[:top],
+        "top_packages": dict(list(_by_package(startup).items())[:top]),
+        "deferred_packages": dict(list(_by_package(deferred).items())[:top]),
+    }
+
+
+def _print_run(i: int, r: dict) -> None:
+    def s(v):
+        return f"{v:.3f}s" if v is not None else "n/a"
+
+    print(f"run {i}: / after {s(r['spawn_to_health_s'])}, /ready after {s(r['spawn_to_ready_s'])}"
+          f"  (imports: {r['import_startup_ms']:.0f} ms at startup,"
+          f" {r['import_deferred_ms']:.0f} ms deferred)")
+    print("  phases: " + ", ".join(f"{k}={v:.3f}s" for k, v in r["phases_s"].items()))
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--top", type=int, default=15, help="modules / packages listed")
+    ap.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for /ready")
+    ap.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                    help="extra server environment (repeatable)")
+    ap.add_argument("--out", type=Path, default=None, help="result file (default results/startup-<commit>.json)")
+    args = ap.parse_args(argv)
+
+    overrides = dict(e.split("=", 1) for e in args.env)
+    runs = []
+    for i in range(1, args.runs + 1):
+        runs.append(run_once(overrides, args.timeout, args.top))
+        _print_run(i, runs[-1])
+
+    last = runs[-1]
+    print(f"\nslowest imports before startup completed (cumulative, run {len(runs)}):")
+    for r in last["top_modules"]:
+        print(f"  {r['cumulative_ms']:>9.1f} ms  {'  ' * r['depth']}{r['module']}")
+    print("\nimport time by top-level package (self):")
+    for pkg, ms in last["top_packages"].items():
+        print(f"  {ms:>9.1f} ms  {pkg}")
+    if last["deferred_packages"]:
+        print("\nimported after startup (preload / first use):")
+        for pkg, ms in last["deferred_packages"].items():
+            print(f"  {ms:>9.1f} ms  {pkg}")
+
+    commit = git_commit()
+    out = args.out or RESULTS_DIR / f"startup-{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    ready = sorted(r["spawn_to_ready_s"] for r in runs if r["spawn_to_ready_s"] is not None)
+    doc = {
+        "commit": commit,
+        "created_utc": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {"runs": args.runs, "env": {**DEFAULT_ENV, **overrides}},
+        "median_spawn_to_ready_s": ready[len(ready) // 2] if ready else None,
+        "runs": runs,
+    }
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(f"\nwrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""ARASAAC circuit breaker: half-open trials, what counts as a failure, image fetches."""
+import time
+
+import httpx
+import pytest
+
+from app import services_google_images as images
+from app.admission import Overloaded
+from app.circuit import CircuitBreaker
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    b = CircuitBreaker("arasaac", failure_threshold=2, reset_after_s=0.01)
+    monkeypatch.setattr(images, "_arasaac_breaker", b)
+    monkeypatch.setattr(images.arasaac_index, "get_index", lambda: None)
+    return b
+
+
+def _use_transport(monkeypatch, handler):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(images.registry, "http", lambda: client)
+
+
+def _trip(b: CircuitBreaker) -> None:
+    for _ in range(b.failure_threshold):
+        b.record_failure()
+    time.sleep(b.reset_after_s * 2)
+
+
+def test_half_open_trial_without_request_is_released(breaker):
+    _trip(breaker)
+    # Budget already spent: the trial never reaches ARASAAC
+    assert images._best_arasaac_png(["water"], time.monotonic() - 1) is None
+    assert breaker.stats()["state"] == "half_open"
+    assert breaker.allow()
+
+
+def test_half_open_trial_with_no_terms_is_released(breaker):
+    _trip(breaker)
+    assert images._best_arasaac_png(["  "], time.monotonic() + 1) is None
+    assert breaker.allow()
+
+
+def test_404_is_an_empty_result_not_a_failure(breaker, monkeypatch):
+    _use_transport(monkeypatch, lambda request: httpx.Response(404))
+    for term in ["amma", "appa", "didi", "bhaiya"]:
+        assert images._best_arasaac_png([term], time.monotonic() + 1) is None
+    assert breaker.stats()["state"] == "closed"
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_5xx_trips_the_breaker(breaker, monkeypatch):
+    _use_transport(monkeypatch, lambda request: httpx.Response(503))
+    for term in ["water", "milk"]:
+        images._best_arasaac_png([term], time.monotonic() + 1)
+    assert breaker.stats()["state"] == "open"
+    assert not breaker.allow()
+
+
+def test_image_fetch_shares_the_breaker(breaker, monkeypatch):
+    _use_transport(monkeypatch, lambda request: httpx.Response(500))
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(httpx.HTTPStatusError):
+            images.fetch_arasaac(images.ARASAAC_PNG.format(1, 1), timeout=1.0)
+    with pytest.raises(Overloaded):
+        images.fetch_arasaac(images.ARASAAC_PNG.format(1, 1), timeout=1.0)
+
+
+def test_image_fetch_404_frees_the_half_open_trial(breaker, monkeypatch):
+    _trip(breaker)
+    _use_transport(monkeypatch, lambda request: httpx.Response(404))
+    with pytest.raises(httpx.HTTPStatusError):
+        images.fetch_arasaac(images.ARASAAC_PNG.format(1, 1), timeout=1.0)
+    assert breaker.allow()
@@ -0,0 +1,107 @@
+"""Event log: idempotent batches, crash replay and workers sharing one log."""
+import asyncio
+import json
+
+import pytest
+
+from app.events import EventLog, _connect
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "events.jsonl", tmp_path / "events.db"
+
+
+def _event(event_id: str, **fields) -> dict:
+    return {
+        "type": "attempt", "learner_id": "l1", "activity_id": "a1", "correct": True,
+        "duration_ms": 100, "event_id": event_id, "ts": "2026-10-14T10:00:00+00:00", **fields,
+    }
+
+
+def _submit(log: EventLog, events: list[dict]) -> dict:
+    async def go():
+        return await log.submit(events)
+
+    return asyncio.run(go())
+
+
+def _totals(log: EventLog) -> dict:
+    return log.rollups(["l1"])["learners"].get("l1", {})
+
+
+def test_retried_events_are_counted_once(paths):
+    log = EventLog(*paths)
+    try:
+        assert _submit(log, [_event("e1"), _event("e1"), _event("e2")]) == {"accepted": 2, "duplicates": 1}
+        assert _submit(log, [_event("e2"), _event("e3", correct=False)]) == {"accepted": 1, "duplicates": 1}
+        assert _totals(log)["attempts"] == 3
+        assert _totals(log)["wrong"] == 1
+    finally:
+        log.close()
+    assert len(paths[0].read_bytes().splitlines()) == 3
+
+
+def test_workers_sharing_a_log_dont_double_count(paths):
+    a, b = EventLog(*paths), EventLog(*paths)
+    try:
+        _submit(a, [_event("e1"), _event("e2")])
+        assert _submit(b, [_event("e2"), _event("e3")]) == {"accepted": 1, "duplicates": 1}
+        _submit(a, [_event("e4")])
+        assert _totals(b)["attempts"] == 4
+    finally:
+        a.close()
+        b.close()
+    assert len(paths[0].read_bytes().splitlines()) == 4
+
+
+def test_unapplied_tail_is_replayed_once(paths):
+    log = EventLog(*paths)
+    try:
+        _submit(log, [_event("e1")])
+    finally:
+        log.close()
+    # A worker died after the fsync, before the rollup commit; the last line is torn
+    with open(paths[0], "ab") as f:
+        for e in (_event("e2"), _event("e2"), _event("e1"), _event("e3")):
+            f.write(json.dumps(e).encode() + b"\n")
+        f.write(b'{"type": "tap", "event_')
+
+    log = EventLog(*paths)
+    try:
+        _submit(log, [_event("e3"), _event("e4")])
+        assert _totals(log)["attempts"] == 4
+    finally:
+        log.close()
+    assert paths[0].read_bytes().endswith(b"\n")
+
+    log = EventLog(*paths)
+    try:
+        _submit(log, [])
+        assert _totals(log)["attempts"] == 4
+    finally:
+        log.close()
+
+
+def test_apply_folds_only_newly_recorded_ids(paths):
+    log = EventLog(*paths)
+    conn = _connect(paths[1])
+    try:
+        assert log._apply(conn, [_event("e1")], 0) == [_event("e1")]
+        assert log._apply(conn, [_event("e1"), _event("e2")], 0) == [_event("e2")]
+        assert _totals(log)["attempts"] == 2
+    finally:
+        conn.close()
+
+
+def test_tail_left_by_another_worker_is_replayed(paths):
+    log = EventLog(*paths)
+    try:
+        _submit(log, [_event("e1")])
+        # Another worker appended, then died before its rollup commit
+        with open(paths[0], "ab") as f:
+            f.write(json.dumps(_event("e2")).encode() + b"\n")
+        _submit(log, [_event("e3")])
+        assert _totals(log)["attempts"] == 3
+    finally:
+        log.close()
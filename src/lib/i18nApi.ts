@@ -5,11 +5,9 @@ const API_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
  * Returns an audio Blob (mp3/wav depending on backend)
  */
 export async function ttsViaApi(text: string, lang: string) {
-  const res = await fetch(`${API_URL}/i18n/tts`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ text, lang }),
-  });
+  // GET so the browser (and any CDN) can cache the audio
+  const params = new URLSearchParams({ text, lang });
+  const res = await fetch(`${API_URL}/i18n/tts?${params}`);
 
   if (!res.ok) {
     const msg = await res.text().catch(() => "");
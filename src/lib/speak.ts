@@ -10,11 +10,9 @@ export async function speakText(
 ): Promise<void> {
   if (!text) return;
 
-  const res = await fetch(`${API_URL}/i18n/tts`, {
-    method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ text, lang }),
-  });
+  // GET so the browser (and any CDN) can cache the audio
+  const params = new URLSearchParams({ text, lang });
+  const res = await fetch(`${API_URL}/i18n/tts?${params}`);
 
   if (!res.ok) {
     console.error("TTS failed:", await res.text());
@@ -1,24 +1,9 @@
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useLocation } from "react-router-dom";
 import { speakText } from "@/lib/speak";
-
-type BoardTile = {
-  id: string;
-  concept: string;
-  label: string;
-  image_url: string;
-  tts_lang?: string;
-};
-
-type BoardResponse = {
-  lang: string;
-  size: number;
-  cats: string[];
-  seed: string;
-  tiles: BoardTile[];
-};
-
-const API_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
+import { useTherapyStore } from "@/stores/therapyStore";
+import { trackEvent } from "@/api/events";
+import { streamAacBoard, AACTile } from "@/api/aac";
 
 const CATEGORY_OPTIONS = [
   { key: "core", label: "Core" },
@@ -46,30 +31,37 @@ export default function BoardGamePage() {
 
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
-  const [board, setBoard] = useState<BoardResponse | null>(null);
-
-  const catsQuery = useMemo(() => selectedCats.join(","), [selectedCats]);
+  /** Board slots in position order; null until that tile has streamed in */
+  const [tiles, setTiles] = useState<(AACTile | null)[] | null>(null);
+  // Tiles from an older request (refresh clicked mid-stream) are ignored
+  const requestId = useRef(0);
 
   async function fetchBoard() {
+    const current = ++requestId.current;
     setLoading(true);
     setError(null);
+    setTiles(Array(size).fill(null));
     try {
-      const url = `${API_URL}/aac/board?lang=${encodeURIComponent(
-        lang
-      )}&size=${size}&cats=${encodeURIComponent(catsQuery)}&seed=${seed}`;
-
-      const res = await fetch(url);
-      if (!res.ok) {
-        const msg = await res.text().catch(() => "");
-        throw new Error(`Board API failed: ${res.status} ${msg}`);
-      }
-      const data = (await res.json()) as BoardResponse;
-      setBoard(data);
+      const summary = await streamAacBoard(
+        { lang, size, cats: selectedCats, seed },
+        (index, tile) => {
+          if (requestId.current !== current) return;
+          setTiles((prev) => {
+            const next = prev ? [...prev] : [];
+            next[index] = tile;
+            return next;
+          });
+        }
+      );
+      if (requestId.current !== current) return;
+      // Fewer concepts than requested: drop the unused slots
+      setTiles((prev) => (prev ? prev.slice(0, summary.count) : prev));
     } catch (e: any) {
+      if (requestId.current !== current) return;
       setError(e?.message || "Failed to load board");
-      setBoard(null);
+      setTiles(null);
     } finally {
-      setLoading(false);
+      if (requestId.current === current) setLoading(false);
     }
   }
 
@@ -224,7 +216,7 @@ export default function BoardGamePage() {
 
         {/* Board */}
         <div className="mt-6">
-          {loading && (
+          {loading && !tiles?.some(Boolean) && (
             <div className="rounded-2xl border bg-card p-6 text-sm text-muted-foreground">
               Loading board…
             </div>
@@ -239,11 +231,19 @@ export default function BoardGamePage() {
             </div>
           )}
 
-          {!loading && !error && board?.tiles?.length && (
+          {/* Tiles appear as they resolve; unresolved slots keep their place */}
+          {!error && tiles?.some(Boolean) && (
             <div className="grid grid-cols-2 gap-3 sm:grid-cols-4 md:grid-cols-5">
-              {board.tiles.map((tile) => (
-                <TileCard key={tile.id} tile={tile} />
-              ))}
+              {tiles.map((tile, i) =>
+                tile ? (
+                  <TileCard key={tile.id} tile={tile} />
+                ) : (
+                  <div
+                    key={`slot_${i}`}
+                    className="h-32 animate-pulse rounded-2xl border bg-card"
+                  />
+                )
+              )}
             </div>
           )}
         </div>
@@ -252,14 +252,22 @@ export default function BoardGamePage() {
   );
 }
 
-function TileCard({ tile }: { tile: BoardTile }) {
+function TileCard({ tile }: { tile: AACTile }) {
   const [imgError, setImgError] = useState(false);
+  const { currentChildId } = useTherapyStore();
+
+  function onTap() {
+    speakText(tile.label, tile.tts_lang || "en");
+    if (currentChildId) {
+      trackEvent({ type: "tap", learner_id: currentChildId, activity_id: "aac-board", item: tile.concept });
+    }
+  }
 
   return (
     <button
       type="button"
       className="rounded-2xl border bg-card p-3 text-center shadow-sm transition hover:shadow-md active:scale-95"
-      onClick={() => speakText(tile.label, tile.tts_lang || "en")}
+      onClick={onTap}
     >
       {/* IMAGE ABOVE TEXT */}
       <div className="flex items-center justify-center">
@@ -6,6 +6,7 @@ import { useTherapyStore } from "@/stores/therapyStore";
 import { ArrowLeft, Volume2 } from "lucide-react";
 import { translateViaApi } from "@/lib/i18nApi";
 import { speakUsingGoogle } from "@/lib/speakApi";
+import { trackEvent } from "@/api/events";
 
 type Card = { id: string; english: string };
 
@@ -85,6 +86,9 @@ export default function ChildActivityView() {
   const instructionText = translated["instruction"] ?? instructionEnglish;
 
   async function speakCard(id: string) {
+    if (currentChildId && activityId) {
+      trackEvent({ type: "tap", learner_id: currentChildId, activity_id: activityId, item: id });
+    }
     const txt = translated[id] ?? cards.find((c) => c.id === id)?.english ?? "";
     await speakUsingGoogle(txt, preferredLang);
   }
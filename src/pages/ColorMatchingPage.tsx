@@ -1,5 +1,7 @@
 import React, { useEffect, useMemo, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
+import { useTherapyStore } from "@/stores/therapyStore";
+import { trackEvent } from "@/api/events";
 
 
 const BOARD_GAME_ROUTE = "/board-game"; // 👈 change if your board game route is different
@@ -118,6 +120,7 @@ function gentleBeep(kind: "good" | "bad") {
 
 export default function ColorMatchingPage() {
   const navigate = useNavigate();
+  const { currentChildId } = useTherapyStore();
 
   // ---- Settings (adjust anytime) ----
   const LEVELS = 8; // total rounds
@@ -244,7 +247,19 @@ export default function ColorMatchingPage() {
     setIdx((p) => p + 1);
   }
 
+  function trackAttempt(correct: boolean) {
+    if (!currentChildId) return;
+    trackEvent({
+      type: "attempt",
+      learner_id: currentChildId,
+      activity_id: "color-matching",
+      item: current.target.key,
+      correct,
+    });
+  }
+
   function markGood() {
+    trackAttempt(true);
     gentleBeep("good");
     setFeedback("good");
     setCorrect((c) => c + 1);
@@ -253,6 +268,7 @@ export default function ColorMatchingPage() {
   }
 
   function markBad() {
+    trackAttempt(false);
     gentleBeep("bad");
     setFeedback("bad");
     setWrong((w) => w + 1);